@@ -3,6 +3,8 @@
 import json
 from datetime import timedelta
 
+import numpy as np
+
 from analytics.utils import utcnow
 
 
@@ -31,22 +33,41 @@ def compute_pathway_score(indicators: dict) -> float:
     return round(min(100.0, max(0.0, score)), 3)
 
 
-def determine_escalation_trend(conn, subject_id, current_score, lookback_days=30):
-    """Compare current assessment to recent history to determine trend."""
-    cutoff = (utcnow() - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
-    rows = conn.execute(
-        """SELECT pathway_score FROM threat_subject_assessments
-        WHERE subject_id = ? AND assessment_date >= ?
-        ORDER BY assessment_date DESC
-        LIMIT 5""",
+def compute_pathway_score_batch(indicator_matrix) -> np.ndarray:
+    """Vectorized compute_pathway_score() over an (N, 8) indicator matrix.
+
+    Columns follow INDICATOR_NAMES order. Weighted columns are accumulated
+    in the same order as the scalar loop, so each row matches it exactly.
+    For a single subject the scalar function is faster.
+    """
+    values = np.asarray(indicator_matrix, dtype=np.float64).reshape(-1, len(INDICATOR_NAMES))
+    values = np.clip(values, 0.0, 1.0)
+    scores = np.zeros(values.shape[0])
+    for column, indicator in enumerate(INDICATOR_NAMES):
+        scores += values[:, column] * PATHWAY_WEIGHTS[indicator] * 100.0
+    return np.round(np.clip(scores, 0.0, 100.0), 3)
+
+
+def determine_escalation_trend(conn, subject_id, current_score, lookback_days=30, now=None):
+    """Compare current assessment to recent history to determine trend.
+
+    ``now`` lets a caller that already holds the current time share it.
+    """
+    cutoff = ((now or utcnow()) - timedelta(days=lookback_days)).isoformat()[:10]
+    row = conn.execute(
+        """SELECT AVG(pathway_score) AS avg_previous, COUNT(*) AS n FROM (
+            SELECT pathway_score FROM threat_subject_assessments
+            WHERE subject_id = ? AND assessment_date >= ?
+            ORDER BY assessment_date DESC
+            LIMIT 5
+        )""",
         (subject_id, cutoff),
-    ).fetchall()
+    ).fetchone()
 
-    if len(rows) < 2:
+    if row["n"] < 2:
         return "stable"
 
-    previous_scores = [float(row["pathway_score"]) for row in rows]
-    avg_previous = sum(previous_scores) / len(previous_scores)
+    avg_previous = float(row["avg_previous"])
 
     if current_score > avg_previous + 5.0:
         return "increasing"
@@ -66,101 +87,162 @@ def score_to_risk_tier(pathway_score):
     return "LOW"
 
 
+_UPSERT_ASSESSMENT_SQL = """INSERT INTO threat_subject_assessments
+    (subject_id, assessment_date, grievance_level, fixation_level,
+     identification_level, novel_aggression, energy_burst, leakage,
+     last_resort, directly_communicated_threat,
+     pathway_score, escalation_trend, evidence_summary,
+     source_alert_ids, analyst_notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(subject_id, assessment_date) DO UPDATE SET
+        grievance_level = excluded.grievance_level,
+        fixation_level = excluded.fixation_level,
+        identification_level = excluded.identification_level,
+        novel_aggression = excluded.novel_aggression,
+        energy_burst = excluded.energy_burst,
+        leakage = excluded.leakage,
+        last_resort = excluded.last_resort,
+        directly_communicated_threat = excluded.directly_communicated_threat,
+        pathway_score = excluded.pathway_score,
+        escalation_trend = excluded.escalation_trend,
+        evidence_summary = excluded.evidence_summary,
+        source_alert_ids = excluded.source_alert_ids,
+        analyst_notes = excluded.analyst_notes"""
+
+_UPDATE_SUBJECT_SQL = """UPDATE threat_subjects
+    SET risk_tier = ?, last_seen = ?, status = 'active'
+    WHERE id = ?"""
+
+
+def _prepare_assessment(conn, now, subject_id, indicators, evidence_summary=None,
+                        source_alert_ids=None, analyst_notes=None):
+    """Score one assessment and build its result dict plus upsert parameters."""
+    assessment_date = now.isoformat()[:10]
+    pathway_score = compute_pathway_score(indicators)
+    escalation_trend = determine_escalation_trend(conn, subject_id, pathway_score, now=now)
+    levels = {k: float(indicators.get(k, 0.0)) for k in INDICATOR_NAMES}
+    params = (
+        subject_id,
+        assessment_date,
+        *levels.values(),
+        pathway_score,
+        escalation_trend,
+        evidence_summary,
+        json.dumps(list(source_alert_ids)) if source_alert_ids else "[]",
+        analyst_notes,
+    )
+    result = {
+        "subject_id": subject_id,
+        "assessment_date": assessment_date,
+        "pathway_score": pathway_score,
+        "escalation_trend": escalation_trend,
+        "risk_tier": score_to_risk_tier(pathway_score),
+        "indicators": levels,
+    }
+    return result, params
+
+
 def upsert_assessment(conn, subject_id, indicators, evidence_summary=None,
                       source_alert_ids=None, analyst_notes=None):
     """Create or update a behavioral assessment for a threat subject."""
-    pathway_score = compute_pathway_score(indicators)
-    escalation_trend = determine_escalation_trend(conn, subject_id, pathway_score)
-    risk_tier = score_to_risk_tier(pathway_score)
-    assessment_date = utcnow().strftime("%Y-%m-%d")
-
-    conn.execute(
-        """INSERT INTO threat_subject_assessments
-        (subject_id, assessment_date, grievance_level, fixation_level,
-         identification_level, novel_aggression, energy_burst, leakage,
-         last_resort, directly_communicated_threat,
-         pathway_score, escalation_trend, evidence_summary,
-         source_alert_ids, analyst_notes)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(subject_id, assessment_date) DO UPDATE SET
-            grievance_level = excluded.grievance_level,
-            fixation_level = excluded.fixation_level,
-            identification_level = excluded.identification_level,
-            novel_aggression = excluded.novel_aggression,
-            energy_burst = excluded.energy_burst,
-            leakage = excluded.leakage,
-            last_resort = excluded.last_resort,
-            directly_communicated_threat = excluded.directly_communicated_threat,
-            pathway_score = excluded.pathway_score,
-            escalation_trend = excluded.escalation_trend,
-            evidence_summary = excluded.evidence_summary,
-            source_alert_ids = excluded.source_alert_ids,
-            analyst_notes = excluded.analyst_notes""",
-        (
-            subject_id,
-            assessment_date,
-            float(indicators.get("grievance_level", 0.0)),
-            float(indicators.get("fixation_level", 0.0)),
-            float(indicators.get("identification_level", 0.0)),
-            float(indicators.get("novel_aggression", 0.0)),
-            float(indicators.get("energy_burst", 0.0)),
-            float(indicators.get("leakage", 0.0)),
-            float(indicators.get("last_resort", 0.0)),
-            float(indicators.get("directly_communicated_threat", 0.0)),
-            pathway_score,
-            escalation_trend,
-            evidence_summary,
-            json.dumps(source_alert_ids or []),
-            analyst_notes,
-        ),
+    now = utcnow()
+    # isoformat slicing is cheaper than strftime for these fixed ISO layouts.
+    last_seen = now.isoformat(sep=" ", timespec="seconds")
+    result, params = _prepare_assessment(
+        conn, now, subject_id, indicators, evidence_summary, source_alert_ids, analyst_notes
     )
+    conn.execute(_UPSERT_ASSESSMENT_SQL, params)
 
     # Update subject risk tier and last_seen
-    conn.execute(
-        """UPDATE threat_subjects
-        SET risk_tier = ?, last_seen = ?, status = 'active'
-        WHERE id = ?""",
-        (risk_tier, utcnow().strftime("%Y-%m-%d %H:%M:%S"), subject_id),
+    conn.execute(_UPDATE_SUBJECT_SQL, (result["risk_tier"], last_seen, subject_id))
+
+    return result
+
+
+def upsert_assessments_bulk(conn, assessments):
+    """
+    Create or update assessments for many subjects (backfill / re-scoring).
+
+    Args:
+        assessments: iterable of dicts with ``subject_id`` and ``indicators``,
+            plus optional ``evidence_summary``, ``source_alert_ids`` and
+            ``analyst_notes`` — the upsert_assessment() keyword arguments.
+
+    Trends are read before any row is written, so each subject may appear
+    at most once per call. Writes share the caller's transaction; commit
+    once after the batch. Returns one upsert_assessment()-shaped dict per
+    input, in order.
+    """
+    now = utcnow()
+    last_seen = now.isoformat(sep=" ", timespec="seconds")
+    results = []
+    assessment_rows = []
+    seen_subjects = set()
+    for item in assessments:
+        subject_id = item["subject_id"]
+        if subject_id in seen_subjects:
+            raise ValueError(f"Duplicate subject_id in bulk assessment: {subject_id}")
+        seen_subjects.add(subject_id)
+        result, params = _prepare_assessment(conn, now, **item)
+        results.append(result)
+        assessment_rows.append(params)
+
+    conn.executemany(_UPSERT_ASSESSMENT_SQL, assessment_rows)
+    conn.executemany(
+        _UPDATE_SUBJECT_SQL,
+        [(result["risk_tier"], last_seen, result["subject_id"]) for result in results],
     )
+    return results
+
+
+_SUBJECT_HISTORY_SQL = """SELECT * FROM threat_subject_assessments
+    WHERE subject_id = ?
+    ORDER BY assessment_date DESC
+    LIMIT ?"""
+
+_ACTIVE_SUBJECTS_SQL = """WITH latest AS (
+        SELECT subject_id, pathway_score, escalation_trend, assessment_date,
+               ROW_NUMBER() OVER (
+                   PARTITION BY subject_id ORDER BY assessment_date DESC
+               ) AS rn
+        FROM threat_subject_assessments
+    )
+    SELECT ts.*,
+           l.pathway_score AS latest_pathway_score,
+           l.escalation_trend AS latest_trend,
+           l.assessment_date AS latest_assessment_date
+    FROM threat_subjects ts
+    LEFT JOIN latest l ON l.subject_id = ts.id AND l.rn = 1
+    WHERE ts.status = 'active'
+      AND COALESCE(l.pathway_score, 0.0) >= ?
+    ORDER BY COALESCE(l.pathway_score, 0.0) DESC"""
 
-    return {
-        "subject_id": subject_id,
-        "assessment_date": assessment_date,
-        "pathway_score": pathway_score,
-        "escalation_trend": escalation_trend,
-        "risk_tier": risk_tier,
-        "indicators": {k: float(indicators.get(k, 0.0)) for k in INDICATOR_NAMES},
-    }
+
+def _rows_to_frame(cursor):
+    """Build a column-oriented DataFrame straight from a cursor's tuples."""
+    import pandas as pd
+
+    columns = [col[0] for col in cursor.description]
+    return pd.DataFrame.from_records([tuple(row) for row in cursor.fetchall()], columns=columns)
 
 
 def get_subject_history(conn, subject_id, limit=20):
     """Get assessment history for a threat subject."""
-    rows = conn.execute(
-        """SELECT * FROM threat_subject_assessments
-        WHERE subject_id = ?
-        ORDER BY assessment_date DESC
-        LIMIT ?""",
-        (subject_id, limit),
-    ).fetchall()
+    rows = conn.execute(_SUBJECT_HISTORY_SQL, (subject_id, limit)).fetchall()
     return [dict(row) for row in rows]
 
 
+def get_subject_history_df(conn, subject_id, limit=20):
+    """get_subject_history() as a DataFrame, for vectorized analytics."""
+    return _rows_to_frame(conn.execute(_SUBJECT_HISTORY_SQL, (subject_id, limit)))
+
+
 def get_active_subjects(conn, min_score=0.0):
     """Get all active threat subjects with their latest assessment."""
-    subjects = conn.execute(
-        """SELECT ts.*,
-                  tsa.pathway_score AS latest_pathway_score,
-                  tsa.escalation_trend AS latest_trend,
-                  tsa.assessment_date AS latest_assessment_date
-        FROM threat_subjects ts
-        LEFT JOIN threat_subject_assessments tsa ON tsa.id = (
-            SELECT id FROM threat_subject_assessments
-            WHERE subject_id = ts.id
-            ORDER BY assessment_date DESC LIMIT 1
-        )
-        WHERE ts.status = 'active'
-          AND COALESCE(tsa.pathway_score, 0.0) >= ?
-        ORDER BY COALESCE(tsa.pathway_score, 0.0) DESC""",
-        (float(min_score),),
-    ).fetchall()
+    subjects = conn.execute(_ACTIVE_SUBJECTS_SQL, (float(min_score),)).fetchall()
     return [dict(row) for row in subjects]
+
+
+def get_active_subjects_df(conn, min_score=0.0):
+    """get_active_subjects() as a DataFrame, for vectorized analytics."""
+    return _rows_to_frame(conn.execute(_ACTIVE_SUBJECTS_SQL, (float(min_score),)))
@@ -19,10 +19,17 @@ import re
 # to avoid matching UUIDs, git SHAs, session tokens, etc.
 _HEX_MIXED_LOOKAHEAD = r"(?=.*[0-9])(?=.*[a-fA-F])"
 
+# Domain label groups are atomic and capped at 32 labels to bound the retry
+# cost on long dotted runs; longer names match as their trailing 32 labels
+# (see analytics/extraction.py).
+_DOMAIN_LABEL = r"(?>[a-zA-Z0-9](?>[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)"
+
 IOC_PATTERNS = {
     "ipv4": re.compile(r"\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b"),
     "domain": re.compile(
-        r"\b(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[A-Za-z]{2,24}\b"
+        r"\b" + _DOMAIN_LABEL + r"{1,30}"
+        r"(?:" + _DOMAIN_LABEL + r"[A-Za-z]{2,24}\b(?!\.[A-Za-z0-9])"
+        r"|[A-Za-z]{2,24}\b(?!\.[A-Za-z]{2,24}\b))"
     ),
     "url": re.compile(r"\bhttps?://[^\s<>'\")]+", re.IGNORECASE),
     "cve": re.compile(r"\bCVE-\d{4}-\d{4,7}\b", re.IGNORECASE),
@@ -6,26 +6,115 @@ All extracted artifacts are persisted to alert_entities.
 """
 
 import re
+from functools import lru_cache
 
 from analytics.entity_extraction import store_alert_entities
 
 _SPACY_ATTEMPTED = False
 _SPACY_NLP = None
 
-ENTITY_LABELS = {"ORG", "PERSON", "GPE", "LOC"}
+# spaCy sees at most MAX_NER_CHARS; the regex IOC scan at most
+# MAX_IOC_SCAN_CHARS, which bounds the cost of paste dumps and sample blobs.
+MAX_NER_CHARS = 20_000
+MAX_IOC_SCAN_CHARS = 200_000
+
+ENTITY_LABELS = frozenset({"ORG", "PERSON", "GPE", "LOC"})
+
+# A long dotted run with no TLD or "@" is retried from every label start, so
+# each attempt must stay short: domain label groups are atomic and capped at
+# 32 labels (31 + TLD), and email local parts at RFC 5321's 64 octets. A
+# MAX_IOC_SCAN_CHARS run of "a." then costs about a second instead of minutes.
+# A 32-label match must end where its dotted run ends, and no shorter match
+# may stop right before a label that could be its TLD, so longer names match
+# as their trailing 32 labels rather than splitting into made-up domains,
+# while a name followed by a non-TLD label still matches ("example.com.8080").
+_DOMAIN_LABEL = r"(?>[a-zA-Z0-9](?>[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)"
 
 IOC_PATTERNS = {
     "cve": re.compile(r"\bCVE-\d{4}-\d{4,7}\b", re.IGNORECASE),
     "ipv4": re.compile(r"\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b"),
-    "ipv6": re.compile(r"\b(?:[0-9a-fA-F]{1,4}:){2,7}[0-9a-fA-F]{1,4}\b"),
-    "domain": re.compile(r"\b(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[A-Za-z]{2,24}\b"),
+    "ipv6": re.compile(r"\b(?>[0-9a-fA-F]{1,4}:){2,7}[0-9a-fA-F]{1,4}\b"),
+    "domain": re.compile(
+        r"\b" + _DOMAIN_LABEL + r"{1,30}"
+        r"(?:" + _DOMAIN_LABEL + r"[A-Za-z]{2,24}\b(?!\.[A-Za-z0-9])"
+        r"|[A-Za-z]{2,24}\b(?!\.[A-Za-z]{2,24}\b))"
+    ),
     "url": re.compile(r"\bhttps?://[^\s<>'\")]+", re.IGNORECASE),
-    "email": re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,24}\b"),
+    "email": re.compile(r"\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]+\.[A-Za-z]{2,24}\b"),
     "md5": re.compile(r"\b[a-fA-F0-9]{32}\b"),
     "sha1": re.compile(r"\b[a-fA-F0-9]{40}\b"),
     "sha256": re.compile(r"\b[a-fA-F0-9]{64}\b"),
 }
 
+# IOC types whose matches can never overlap one another share one combined
+# scan; it finds exactly what their separate finditer passes would. URL,
+# email, IPv6 and domain matches can contain or straddle other IOCs (host
+# IPs, path hashes, userinfo emails, "ffff:192.168.1.1", "10:20:30.example.com"),
+# so each keeps its own pass rather than consuming the others' characters.
+_DISJOINT_TYPES = ("cve", "ipv4", "sha256", "sha1", "md5")
+_SPAN_TYPES = ("url", "email", "ipv6")
+
+
+def _combine(ioc_types):
+    return re.compile(
+        "|".join(f"(?P<{ioc_type}>{IOC_PATTERNS[ioc_type].pattern})" for ioc_type in ioc_types),
+        re.IGNORECASE,
+    )
+
+
+_DISJOINT_IOC_SCAN = _combine(_DISJOINT_TYPES)
+
+_UPPERCASE_IOC_TYPES = frozenset({"cve"})
+_LOWERCASE_IOC_TYPES = frozenset({"domain", "email", "md5", "sha1", "sha256"})
+_IOC_EDGE_PUNCTUATION = ".,);"
+
+# File names ("payload.exe", "report.pdf") match the domain pattern. These
+# extensions are not delegated TLDs, so a "domain" ending in one is never a
+# real host. Extensions that are also TLDs (.zip, .mov, .py, .sh) stay.
+_FILE_EXTENSION_SUFFIXES = frozenset(
+    {
+        "bat",
+        "bin",
+        "cfg",
+        "csv",
+        "dat",
+        "dll",
+        "doc",
+        "docm",
+        "docx",
+        "exe",
+        "gif",
+        "htm",
+        "html",
+        "ini",
+        "iso",
+        "jar",
+        "jpeg",
+        "jpg",
+        "js",
+        "json",
+        "lnk",
+        "log",
+        "msi",
+        "pdf",
+        "php",
+        "png",
+        "ppt",
+        "pptx",
+        "rar",
+        "scr",
+        "tmp",
+        "txt",
+        "vbs",
+        "xls",
+        "xlsm",
+        "xlsx",
+        "xml",
+        "yaml",
+        "yml",
+    }
+)
+
 
 def _context_snippet(text, start, end, window=60):
     left = max(0, start - window)
@@ -42,52 +131,115 @@ def _load_spacy_model():
     try:
         import spacy  # pylint: disable=import-outside-toplevel
 
-        _SPACY_NLP = spacy.load("en_core_web_sm")
+        # Only doc.ents is consumed; skip the pipes NER does not depend on.
+        _SPACY_NLP = spacy.load(
+            "en_core_web_sm", disable=["parser", "lemmatizer", "attribute_ruler"]
+        )
     except Exception:
         _SPACY_NLP = None
     return _SPACY_NLP
 
 
+@lru_cache(maxsize=1024)
+def _spacy_entities(text):
+    """Run spaCy NER and return ``(label, text, start_char, end_char)`` tuples.
+
+    Cached on the (already truncated) input so recurring alert bodies —
+    reposts, retweets, mirrored feed items — skip the NER pass entirely.
+    """
+    return _entity_tuples(_load_spacy_model()(text))
+
+
+def _entity_tuples(doc):
+    return tuple(
+        (ent.label_, ent.text, ent.start_char, ent.end_char)
+        for ent in doc.ents
+        if ent.label_ in ENTITY_LABELS
+    )
+
+
 def _normalize_ioc(ioc_type, value):
-    normalized = value.strip().strip(".,);")
-    if ioc_type in {"cve"}:
+    normalized = value.strip().strip(_IOC_EDGE_PUNCTUATION)
+    if ioc_type in _UPPERCASE_IOC_TYPES:
         return normalized.upper()
-    if ioc_type in {"domain", "email", "md5", "sha1", "sha256"}:
+    if ioc_type in _LOWERCASE_IOC_TYPES:
         return normalized.lower()
     return normalized
 
 
 def _extract_iocs(text):
+    matches = [(match.lastgroup, match) for match in _DISJOINT_IOC_SCAN.finditer(text)]
+    skip_spans = []
+    for ioc_type in _SPAN_TYPES:
+        for match in IOC_PATTERNS[ioc_type].finditer(text):
+            matches.append((ioc_type, match))
+            if ioc_type != "ipv6":
+                skip_spans.append((match.start(), match.end()))
+
+    # Domains inside a URL or email are part of that IOC, not separate hosts.
+    # Both lists are in text order, so one forward pointer finds the overlaps.
+    skip_spans.sort()
+    skip_idx = 0
+    for match in IOC_PATTERNS["domain"].finditer(text):
+        start, end = match.span()
+        while skip_idx < len(skip_spans) and skip_spans[skip_idx][1] <= start:
+            skip_idx += 1
+        if skip_idx < len(skip_spans) and skip_spans[skip_idx][0] < end:
+            continue
+        matches.append(("domain", match))
+
+    # Text order; the first occurrence of each (type, value) supplies the context.
+    matches.sort(key=lambda item: item[1].start())
     findings = []
     seen = set()
-
-    spans_to_skip = []
-    for pattern in (IOC_PATTERNS["url"], IOC_PATTERNS["email"]):
-        for match in pattern.finditer(text):
-            spans_to_skip.append((match.start(), match.end()))
-
-    def _overlaps_skip(start, end):
-        return any(start < s_end and end > s_start for s_start, s_end in spans_to_skip)
-
-    for ioc_type, pattern in IOC_PATTERNS.items():
-        for match in pattern.finditer(text):
-            if ioc_type == "domain" and _overlaps_skip(match.start(), match.end()):
-                continue
-            normalized = _normalize_ioc(ioc_type, match.group(0))
-            key = (ioc_type, normalized)
-            if key in seen:
-                continue
-            seen.add(key)
-            findings.append(
-                {
-                    "type": ioc_type,
-                    "value": normalized,
-                    "context": _context_snippet(text, match.start(), match.end()),
-                }
-            )
+    for ioc_type, match in matches:
+        normalized = _normalize_ioc(ioc_type, match.group(0))
+        if ioc_type == "domain" and normalized.rpartition(".")[2] in _FILE_EXTENSION_SUFFIXES:
+            continue
+        key = (ioc_type, normalized)
+        if key in seen:
+            continue
+        seen.add(key)
+        findings.append(
+            {
+                "type": ioc_type,
+                "value": normalized,
+                "context": _context_snippet(text, match.start(), match.end()),
+            }
+        )
     return findings
 
 
+def _build_extraction(safe_text, entity_tuples, extractor_used):
+    entities = []
+    entity_seen = set()
+    for label, raw_value, start_char, end_char in entity_tuples:
+        value = raw_value.strip()
+        if not value:
+            continue
+        key = (label, value.lower())
+        if key in entity_seen:
+            continue
+        entity_seen.add(key)
+        entities.append(
+            {
+                "type": label,
+                "value": value,
+                "confidence": 1.0,
+                "context": _context_snippet(safe_text, start_char, end_char),
+            }
+        )
+
+    return {
+        "entities": entities,
+        "iocs": _extract_iocs(safe_text[:MAX_IOC_SCAN_CHARS]),
+        "meta": {
+            "extractor_used": extractor_used,
+            "ioc_scan_truncated": len(safe_text) > MAX_IOC_SCAN_CHARS,
+        },
+    }
+
+
 def extract(text):
     """
     Extract entities and IOCs from unstructured text.
@@ -96,54 +248,63 @@ def extract(text):
         {
             "entities": [{type, value, confidence, context}],
             "iocs": [{type, value, context}],
-            "meta": {"extractor_used": "..."}
+            "meta": {"extractor_used": "...", "ioc_scan_truncated": bool}
         }
     """
     safe_text = text or ""
-    entities = []
-    entity_seen = set()
+    if _load_spacy_model():
+        return _build_extraction(
+            safe_text, _spacy_entities(safe_text[:MAX_NER_CHARS]), "spacy+regex"
+        )
+    return _build_extraction(safe_text, (), "regex")
 
-    nlp = _load_spacy_model()
-    extractor_used = "regex"
-
-    if nlp:
-        extractor_used = "spacy+regex"
-        doc = nlp(safe_text[:20000])
-        for ent in doc.ents:
-            if ent.label_ not in ENTITY_LABELS:
-                continue
-            value = ent.text.strip()
-            if not value:
-                continue
-            key = (ent.label_, value.lower())
-            if key in entity_seen:
-                continue
-            entity_seen.add(key)
-            entities.append(
-                {
-                    "type": ent.label_,
-                    "value": value,
-                    "confidence": 1.0,
-                    "context": _context_snippet(safe_text, ent.start_char, ent.end_char),
-                }
-            )
-
-    iocs = _extract_iocs(safe_text)
 
-    return {
-        "entities": entities,
-        "iocs": iocs,
-        "meta": {"extractor_used": extractor_used},
-    }
+def extract_batch(texts, batch_size=64):
+    """
+    Batched extract(): runs spaCy once over all texts via ``nlp.pipe``.
 
+    Returns one extract()-shaped dict per input text, in order.
+    """
+    safe_texts = [text or "" for text in texts]
+    nlp = _load_spacy_model()
+    if not nlp:
+        return [_build_extraction(text, (), "regex") for text in safe_texts]
+
+    docs = nlp.pipe((text[:MAX_NER_CHARS] for text in safe_texts), batch_size=batch_size)
+    return [
+        _build_extraction(text, _entity_tuples(doc), "spacy+regex")
+        for text, doc in zip(safe_texts, docs)
+    ]
 
-def extract_and_store_alert_artifacts(conn, alert_id, text):
-    """Extract entities/IOCs and persist flat artifacts for one alert."""
-    extracted = extract(text)
 
-    artifacts = [
+def _artifacts(extracted):
+    return [
         {"entity_type": item["type"], "entity_value": item["value"]}
         for item in extracted["entities"] + extracted["iocs"]
     ]
-    store_alert_entities(conn, alert_id, artifacts)
+
+
+def extract_and_store_alert_artifacts(conn, alert_id, text):
+    """Extract entities/IOCs and persist flat artifacts for one alert."""
+    extracted = extract(text)
+    store_alert_entities(conn, alert_id, _artifacts(extracted))
     return extracted
+
+
+def extract_and_store_batch(conn, alerts):
+    """
+    Extract and persist artifacts for many alerts with one spaCy pass.
+
+    Args:
+        alerts: iterable of ``(alert_id, text)`` pairs
+
+    Returns {alert_id: extraction}. Inserts share the caller's transaction;
+    commit once after the batch.
+    """
+    alerts = list(alerts)
+    extractions = extract_batch([text for _, text in alerts])
+    results = {}
+    for (alert_id, _), extracted in zip(alerts, extractions):
+        store_alert_entities(conn, alert_id, _artifacts(extracted))
+        results[alert_id] = extracted
+    return results
@@ -16,10 +16,20 @@ Severity derivation:
   0-39   = low
 """
 
+from bisect import bisect_right
 from datetime import timedelta
 
+import numpy as np
+
 from analytics.utils import compute_recency_factor, utcnow
 
+# Lower bounds of medium/high/critical; index i of a score's bin is its
+# position in SEVERITY_LABELS. Shared by the scalar bisect in
+# score_to_severity() and the vectorized searchsorted in the batch path.
+SEVERITY_LABELS = ("low", "medium", "high", "critical")
+_SEVERITY_THRESHOLD_VALUES = (40.0, 70.0, 90.0)
+_SEVERITY_THRESHOLDS = np.array(_SEVERITY_THRESHOLD_VALUES)
+
 
 def compute_risk_score(keyword_weight, source_credibility, frequency_factor, recency_hours):
     """
@@ -35,6 +45,23 @@ def compute_risk_score(keyword_weight, source_credibility, frequency_factor, rec
         (risk_score, severity) tuple
     """
     recency_factor = max(0.1, 1.0 - (max(0.0, recency_hours) / 168.0))
+    return compute_risk_score_from_factor(
+        keyword_weight, source_credibility, frequency_factor, recency_factor
+    )
+
+
+def compute_risk_score_from_factor(
+    keyword_weight, source_credibility, frequency_factor, recency_factor
+):
+    """
+    compute_risk_score() for callers that already hold the recency factor.
+
+    The scoring pipeline gets the factor from compute_recency_factor(), so this
+    skips converting it back to hours and re-deriving it.
+
+    Returns:
+        (risk_score, severity) tuple
+    """
     raw_score = (keyword_weight * frequency_factor * source_credibility * 20.0) + (
         recency_factor * 10.0
     )
@@ -43,15 +70,48 @@ def compute_risk_score(keyword_weight, source_credibility, frequency_factor, rec
     return risk_score, severity
 
 
+def compute_risk_score_batch(
+    keyword_weights, source_credibilities, frequency_factors, recency_hours
+):
+    """
+    Vectorized compute_risk_score() over parallel input arrays.
+
+    Applies the same formula element-wise and bins severities in the same
+    pass, so a whole batch is scored without one Python call per row.
+    Scores are bit-identical to compute_risk_score().
+
+    Returns:
+        (risk_scores, severity_codes) tuple — float64 ndarray and int8 ndarray
+        of indexes into SEVERITY_LABELS
+    """
+    keyword_weights = np.asarray(keyword_weights, dtype=np.float64)
+    source_credibilities = np.asarray(source_credibilities, dtype=np.float64)
+    frequency_factors = np.asarray(frequency_factors, dtype=np.float64)
+    recency_hours = np.asarray(recency_hours, dtype=np.float64)
+
+    recency_factors = np.maximum(0.1, 1.0 - (np.maximum(0.0, recency_hours) / 168.0))
+    raw_scores = (keyword_weights * frequency_factors * source_credibilities * 20.0) + (
+        recency_factors * 10.0
+    )
+    clamped = np.clip(raw_scores, 0.0, 100.0)
+    risk_scores = np.round(clamped, 1)
+    # np.round rounds clamped * 10 half-to-even, which can land 0.1 away from
+    # the correctly rounded round() when that product sits at a .5 tie. Only
+    # those few near-tie elements are re-rounded in Python.
+    near_tie = np.flatnonzero(np.abs((clamped * 10.0) % 1.0 - 0.5) < 1e-6)
+    for idx in near_tie.tolist():
+        risk_scores[idx] = round(float(clamped[idx]), 1)
+    return risk_scores, score_to_severity_codes(risk_scores)
+
+
+def score_to_severity_codes(scores):
+    """Vectorized score_to_severity(): int8 indexes into SEVERITY_LABELS."""
+    return np.searchsorted(_SEVERITY_THRESHOLDS, scores, side="right").astype(np.int8)
+
+
 def score_to_severity(score):
     """Map numeric score to severity label."""
-    if score >= 90:
-        return "critical"
-    elif score >= 70:
-        return "high"
-    elif score >= 40:
-        return "medium"
-    return "low"
+    return SEVERITY_LABELS[bisect_right(_SEVERITY_THRESHOLD_VALUES, score)]
 
 
 def score_to_severity_with_uncertainty(point_score, interval_mean=None):
@@ -88,7 +148,27 @@ def get_source_credibility(conn, source_id):
     ).fetchone()
     if not row:
         return 0.5
+    return _credibility_from_row(row)
+
+
+def _keyword_weight_and_credibility(conn, keyword_id, source_id):
+    """get_keyword_weight() and get_source_credibility() in one round-trip."""
+    row = conn.execute(
+        """SELECT (SELECT weight FROM keywords WHERE id = ?) AS weight,
+                  s.id AS source_row_id, s.credibility_score, s.bayesian_alpha,
+                  s.bayesian_beta, s.true_positives, s.false_positives
+        FROM (SELECT 1)
+        LEFT JOIN sources s ON s.id = ?""",
+        (keyword_id, source_id),
+    ).fetchone()
+    keyword_weight = row["weight"] if row["weight"] else 1.0
+    if row["source_row_id"] is None:
+        return keyword_weight, 0.5
+    return keyword_weight, _credibility_from_row(row)
 
+
+def _credibility_from_row(row):
+    """Credibility from a row carrying the sources Bayesian/TP/FP columns."""
     alpha = row["bayesian_alpha"] if row["bayesian_alpha"] else 2.0
     beta = row["bayesian_beta"] if row["bayesian_beta"] else 2.0
 
@@ -109,22 +189,26 @@ def get_frequency_factor(conn, keyword_id):
     Returns:
         (frequency_factor, z_score) tuple
     """
-    today = utcnow().strftime("%Y-%m-%d")
+    now = utcnow()
+    today = now.strftime("%Y-%m-%d")
     today_row = conn.execute(
         "SELECT count FROM keyword_frequency WHERE keyword_id = ? AND date = ?",
         (keyword_id, today),
     ).fetchone()
     today_count = today_row["count"] if today_row else 0
 
-    seven_days_ago = (utcnow() - timedelta(days=7)).strftime("%Y-%m-%d")
+    seven_days_ago = (now - timedelta(days=7)).strftime("%Y-%m-%d")
     rows = conn.execute(
         """SELECT count FROM keyword_frequency
         WHERE keyword_id = ? AND date >= ? AND date < ?""",
         (keyword_id, seven_days_ago, today),
     ).fetchall()
 
-    counts = [row["count"] for row in rows]
+    return _frequency_factor_from_counts(today_count, [row["count"] for row in rows])
 
+
+def _frequency_factor_from_counts(today_count, counts):
+    """Map today's count against the prior-7-day counts to (factor, z_score)."""
     if len(counts) < 3:
         # Fallback to simple ratio for insufficient data
         avg = sum(counts) / len(counts) if counts else 1.0
@@ -155,11 +239,43 @@ def get_frequency_factor(conn, keyword_id):
 
 
 def build_frequency_snapshot(conn, keyword_ids=None):
-    """Build a keyword -> (frequency_factor, z_score) snapshot for a scoring cycle."""
+    """Build a keyword -> (frequency_factor, z_score) snapshot for a scoring cycle.
+
+    Reads the whole 8-day window for every keyword in one query (served by
+    the keyword_frequency (keyword_id, date) unique index) instead of two
+    queries per keyword.
+    """
     if keyword_ids is None:
         rows = conn.execute("SELECT id FROM keywords WHERE active = 1").fetchall()
         keyword_ids = [row["id"] for row in rows]
-    return {keyword_id: get_frequency_factor(conn, keyword_id) for keyword_id in keyword_ids}
+    keyword_ids = list(keyword_ids)
+
+    now = utcnow()
+    today = now.strftime("%Y-%m-%d")
+    seven_days_ago = (now - timedelta(days=7)).strftime("%Y-%m-%d")
+    today_counts = {}
+    history = {}
+    wanted = {keyword_id for keyword_id in keyword_ids if keyword_id is not None}
+    if wanted:
+        placeholders = ",".join("?" for _ in wanted)
+        rows = conn.execute(
+            f"""SELECT keyword_id, date, count FROM keyword_frequency
+            WHERE date >= ? AND date <= ? AND keyword_id IN ({placeholders})
+            ORDER BY keyword_id, date""",
+            [seven_days_ago, today, *wanted],
+        ).fetchall()
+        for row in rows:
+            if row["date"] == today:
+                today_counts[row["keyword_id"]] = row["count"]
+            else:
+                history.setdefault(row["keyword_id"], []).append(row["count"])
+
+    return {
+        keyword_id: _frequency_factor_from_counts(
+            today_counts.get(keyword_id, 0), history.get(keyword_id, [])
+        )
+        for keyword_id in keyword_ids
+    }
 
 
 def increment_keyword_frequency(conn, keyword_id, increment_by=1):
@@ -176,6 +292,11 @@ def increment_keyword_frequency(conn, keyword_id, increment_by=1):
     )
 
 
+_INSERT_ALERT_SCORE_SQL = """INSERT INTO alert_scores
+    (alert_id, keyword_weight, source_credibility, frequency_factor, z_score, recency_factor, final_score)
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
+
+
 def score_alert(
     conn,
     alert_id,
@@ -191,29 +312,26 @@ def score_alert(
     Computes score, updates alert, and stores audit trail in alert_scores.
     Returns the final risk score.
     """
-    keyword_weight = get_keyword_weight(conn, keyword_id)
-    source_credibility = get_source_credibility(conn, source_id)
+    keyword_weight, source_credibility = _keyword_weight_and_credibility(
+        conn, keyword_id, source_id
+    )
     if frequency_override is not None:
         frequency_factor = frequency_override
         z_score = z_score_override if z_score_override is not None else 0.0
     else:
         frequency_factor, z_score = get_frequency_factor(conn, keyword_id)
 
-    recency_factor, recency_hours = compute_recency_factor(
-        published_at=published_at, created_at=created_at
-    )
+    recency_factor, _ = compute_recency_factor(published_at=published_at, created_at=created_at)
 
-    risk_score, severity = compute_risk_score(
-        keyword_weight, source_credibility, frequency_factor, recency_hours
+    risk_score, severity = compute_risk_score_from_factor(
+        keyword_weight, source_credibility, frequency_factor, recency_factor
     )
     conn.execute(
         "UPDATE alerts SET risk_score = ?, severity = ? WHERE id = ?",
         (risk_score, severity, alert_id),
     )
     conn.execute(
-        """INSERT INTO alert_scores
-        (alert_id, keyword_weight, source_credibility, frequency_factor, z_score, recency_factor, final_score)
-        VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        _INSERT_ALERT_SCORE_SQL,
         (
             alert_id,
             keyword_weight,
@@ -227,40 +345,6 @@ def score_alert(
     return risk_score
 
 
-def _batch_keyword_weights(conn, keyword_ids):
-    """Fetch keyword weights in bulk. Returns {keyword_id: weight}."""
-    if not keyword_ids:
-        return {}
-    placeholders = ",".join("?" for _ in keyword_ids)
-    rows = conn.execute(
-        f"SELECT id, weight FROM keywords WHERE id IN ({placeholders})",
-        list(keyword_ids),
-    ).fetchall()
-    return {row["id"]: (row["weight"] if row["weight"] else 1.0) for row in rows}
-
-
-def _batch_source_credibilities(conn, source_ids):
-    """Fetch source credibilities in bulk. Returns {source_id: credibility}."""
-    if not source_ids:
-        return {}
-    placeholders = ",".join("?" for _ in source_ids)
-    rows = conn.execute(
-        f"""SELECT id, credibility_score, bayesian_alpha, bayesian_beta,
-                   true_positives, false_positives
-            FROM sources WHERE id IN ({placeholders})""",
-        list(source_ids),
-    ).fetchall()
-    result = {}
-    for row in rows:
-        alpha = row["bayesian_alpha"] if row["bayesian_alpha"] else 2.0
-        beta = row["bayesian_beta"] if row["bayesian_beta"] else 2.0
-        if (row["true_positives"] or 0) == 0 and (row["false_positives"] or 0) == 0:
-            result[row["id"]] = row["credibility_score"] if row["credibility_score"] else 0.5
-        else:
-            result[row["id"]] = round(alpha / (alpha + beta), 4)
-    return result
-
-
 def rescore_all_alerts(conn, frequency_snapshot=None):
     """
     Re-score all unreviewed alerts with current weights, Bayesian credibility,
@@ -274,33 +358,40 @@ def rescore_all_alerts(conn, frequency_snapshot=None):
 
     Returns count of alerts rescored.
     """
+    # One query carries every per-alert scoring input; LEFT JOINs keep alerts
+    # whose keyword/source row is missing (weight 1.0, credibility 0.5).
     alerts = conn.execute(
-        """SELECT a.id, a.keyword_id, a.source_id, a.created_at, a.published_at
-        FROM alerts a WHERE a.reviewed = 0"""
+        """SELECT a.id, a.keyword_id, a.source_id, a.created_at, a.published_at,
+                  k.weight,
+                  s.id AS source_row_id, s.credibility_score, s.bayesian_alpha,
+                  s.bayesian_beta, s.true_positives, s.false_positives
+        FROM alerts a
+        LEFT JOIN keywords k ON k.id = a.keyword_id
+        LEFT JOIN sources s ON s.id = a.source_id
+        WHERE a.reviewed = 0"""
     ).fetchall()
 
     if frequency_snapshot is None:
         keyword_ids = list({alert["keyword_id"] for alert in alerts})
         frequency_snapshot = build_frequency_snapshot(conn, keyword_ids=keyword_ids)
 
-    # Batch-fetch keyword weights and source credibilities to avoid N+1 queries
-    all_keyword_ids = {alert["keyword_id"] for alert in alerts if alert["keyword_id"]}
-    all_source_ids = {alert["source_id"] for alert in alerts if alert["source_id"]}
-    weight_cache = _batch_keyword_weights(conn, all_keyword_ids)
-    cred_cache = _batch_source_credibilities(conn, all_source_ids)
-
     # Import locally to avoid circular module initialization:
     # ep_scoring -> risk_scoring (score_to_severity) and this path needs ep_scoring.
     from analytics.ep_scoring import compute_operational_score
 
-    count = 0
+    # One clock read per cycle: every alert's recency is measured from it.
+    now = utcnow()
+    alert_updates = []
+    score_rows = []
     for alert in alerts:
         score_args = frequency_snapshot.get(alert["keyword_id"])
         freq_override = score_args[0] if score_args else None
         z_override = score_args[1] if score_args else None
 
-        keyword_weight = weight_cache.get(alert["keyword_id"], 1.0)
-        source_credibility = cred_cache.get(alert["source_id"], 0.5)
+        keyword_weight = alert["weight"] if alert["weight"] else 1.0
+        source_credibility = (
+            _credibility_from_row(alert) if alert["source_row_id"] is not None else 0.5
+        )
 
         if freq_override is not None:
             frequency_factor = freq_override
@@ -308,21 +399,15 @@ def rescore_all_alerts(conn, frequency_snapshot=None):
         else:
             frequency_factor, z_score = get_frequency_factor(conn, alert["keyword_id"])
 
-        recency_factor, recency_hours = compute_recency_factor(
-            published_at=alert["published_at"], created_at=alert["created_at"]
+        recency_factor, _ = compute_recency_factor(
+            published_at=alert["published_at"], created_at=alert["created_at"], now=now
         )
 
-        risk_score, severity = compute_risk_score(
-            keyword_weight, source_credibility, frequency_factor, recency_hours
+        risk_score, severity = compute_risk_score_from_factor(
+            keyword_weight, source_credibility, frequency_factor, recency_factor
         )
-        conn.execute(
-            "UPDATE alerts SET risk_score = ?, severity = ? WHERE id = ?",
-            (risk_score, severity, alert["id"]),
-        )
-        conn.execute(
-            """INSERT INTO alert_scores
-            (alert_id, keyword_weight, source_credibility, frequency_factor, z_score, recency_factor, final_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        alert_updates.append((risk_score, severity, alert["id"]))
+        score_rows.append(
             (
                 alert["id"],
                 keyword_weight,
@@ -331,12 +416,16 @@ def rescore_all_alerts(conn, frequency_snapshot=None):
                 z_score,
                 recency_factor,
                 risk_score,
-            ),
+            )
         )
+
+    conn.executemany("UPDATE alerts SET risk_score = ?, severity = ? WHERE id = ?", alert_updates)
+    conn.executemany(_INSERT_ALERT_SCORE_SQL, score_rows)
+    # ORS reads the alert_scores row written above, so it runs after the batch.
+    for alert in alerts:
         compute_operational_score(conn, alert["id"])
-        count += 1
     conn.commit()
-    return count
+    return len(alerts)
 
 
 def update_source_credibility_bayesian(conn, source_id, is_true_positive):
@@ -385,20 +474,32 @@ def compute_evaluation_metrics(conn, source_id=None):
     analysts who review without classifying inflate FN and depress recall.
     Enforce TP/FP classification on every reviewed alert for accurate recall.
     """
-    if source_id is not None:
-        source = conn.execute("SELECT * FROM sources WHERE id = ?", (source_id,)).fetchone()
-        sources = [source] if source else []
+    # Reviewed-alert counts for every source come from one grouped subquery
+    # rather than a COUNT(*) per source.
+    if source_id is None:
+        alert_filter, source_filter, params = "", "", ()
     else:
-        sources = conn.execute("SELECT * FROM sources").fetchall()
+        alert_filter, source_filter = "AND source_id = ?", "WHERE s.id = ?"
+        params = (source_id, source_id)
+    sources = conn.execute(
+        f"""SELECT s.*, COALESCE(r.reviewed_count, 0) AS reviewed_count
+        FROM sources s
+        LEFT JOIN (
+            SELECT source_id, COUNT(*) AS reviewed_count
+            FROM alerts
+            WHERE reviewed = 1 {alert_filter}
+            GROUP BY source_id
+        ) r ON r.source_id = s.id
+        {source_filter}
+        ORDER BY s.id""",
+        params,
+    ).fetchall()
 
     results = []
     for src in sources:
         tp = src["true_positives"] or 0
         fp = src["false_positives"] or 0
-        reviewed_count = conn.execute(
-            "SELECT COUNT(*) as count FROM alerts WHERE source_id = ? AND reviewed = 1",
-            (src["id"],),
-        ).fetchone()["count"]
+        reviewed_count = src["reviewed_count"]
 
         fn = max(0, reviewed_count - (tp + fp))
         precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
@@ -1,9 +1,13 @@
 """TRAP-lite threat assessment scoring for protectees."""
 
 import json
+import os
 import re
+from bisect import bisect_right
 from collections import defaultdict
-from datetime import timedelta
+from datetime import datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
 
 import yaml
 
@@ -25,10 +29,23 @@ TARGETING_TIME_PATTERNS = [
 ]
 
 
-def _assessment_window_bounds(window_days):
+def _any_of(patterns):
+    """Fold a pattern group into one alternation so the group costs one search."""
+    return re.compile("|".join(f"(?:{pattern.pattern})" for pattern in patterns), re.IGNORECASE)
+
+
+# RE2 sets / Hyperscan are not dependencies here, and a single scan across all
+# groups would hide overlapping matches ("tomorrow" is both leakage and
+# targeting-time), so each group keeps its own combined pattern.
+_LEAKAGE_SCAN = _any_of(LEAKAGE_PATTERNS)
+_PATHWAY_SCAN = _any_of(PATHWAY_PATTERNS)
+_TARGETING_TIME_SCAN = _any_of(TARGETING_TIME_PATTERNS)
+
+
+def _assessment_window_bounds(window_days, now=None):
     # Anchor to day boundaries so repeated runs during the same day upsert
     # the same rolling window row.
-    now = utcnow()
+    now = now or utcnow()
     window_end_dt = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
     window_start_dt = window_end_dt - timedelta(days=window_days)
     return (
@@ -37,10 +54,13 @@ def _assessment_window_bounds(window_days):
     )
 
 
-def _compute_energy_burst(day_counts):
-    today = utcnow().strftime("%Y-%m-%d")
+# Days are keyed as integer days since the Unix epoch (UTC), as computed in SQL.
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _compute_energy_burst(day_counts, ordered_days, today):
     today_count = day_counts.get(today, 0)
-    baseline_days = sorted(day_counts.keys())[-8:-1]
+    baseline_days = ordered_days[-8:-1]
     baseline = [day_counts[d] for d in baseline_days]
     if len(baseline) < 3:
         return False, 0.0
@@ -51,59 +71,66 @@ def _compute_energy_burst(day_counts):
     return z >= 2.0, round(z, 3)
 
 
-def _source_beta_for_poi(conn, poi_id, window_start, window_end):
-    rows = conn.execute(
-        """SELECT s.bayesian_alpha, s.bayesian_beta
-        FROM poi_hits ph
-        JOIN alerts a ON a.id = ph.alert_id
-        JOIN sources s ON s.id = a.source_id
-        WHERE ph.poi_id = ?
-          AND datetime(COALESCE(a.published_at, a.created_at)) >= datetime(?)
-          AND datetime(COALESCE(a.published_at, a.created_at)) < datetime(?)""",
-        (poi_id, window_start, window_end),
-    ).fetchall()
-    if not rows:
+def _source_beta_from_rows(rows):
+    """Average the Bayesian alpha/beta of the sources behind a POI's window hits."""
+    sourced = [row for row in rows if row["source_row_id"] is not None]
+    if not sourced:
         return 2.0, 2.0
-    alpha = sum(float(row["bayesian_alpha"] or 2.0) for row in rows) / len(rows)
-    beta = sum(float(row["bayesian_beta"] or 2.0) for row in rows) / len(rows)
+    alpha = sum(float(row["bayesian_alpha"] or 2.0) for row in sourced) / len(sourced)
+    beta = sum(float(row["bayesian_beta"] or 2.0) for row in sourced) / len(sourced)
     return max(0.01, alpha), max(0.01, beta)
 
 
-def compute_poi_assessment(conn, poi_id, window_days=14, n=500):
-    window_start, window_end = _assessment_window_bounds(window_days)
-
-    rows = conn.execute(
-        """SELECT ph.context, ph.match_value,
-                  a.id AS alert_id, a.title, a.content,
-                  date(COALESCE(a.published_at, a.created_at)) AS day,
-                  EXISTS(SELECT 1 FROM alert_locations al WHERE al.alert_id = a.id) AS has_location
-        FROM poi_hits ph
-        JOIN alerts a ON a.id = ph.alert_id
-        WHERE ph.poi_id = ?
-          AND datetime(COALESCE(a.published_at, a.created_at)) >= datetime(?)
-          AND datetime(COALESCE(a.published_at, a.created_at)) < datetime(?)
-        ORDER BY COALESCE(a.published_at, a.created_at) ASC""",
-        (poi_id, window_start, window_end),
-    ).fetchall()
-
-    if not rows:
-        return None
-
+# Window hits for a set of POIs, with each hit's source priors alongside so
+# the credibility interval needs no second query.
+_POI_WINDOW_HITS_SQL = """SELECT ph.poi_id, ph.context, ph.match_value,
+          a.id AS alert_id, a.title, a.content,
+          CAST(strftime('%s', COALESCE(a.published_at, a.created_at)) AS INTEGER) / 86400 AS day,
+          EXISTS(SELECT 1 FROM alert_locations al WHERE al.alert_id = a.id) AS has_location,
+          s.id AS source_row_id, s.bayesian_alpha, s.bayesian_beta
+FROM poi_hits ph
+JOIN alerts a ON a.id = ph.alert_id
+LEFT JOIN sources s ON s.id = a.source_id
+WHERE ph.poi_id IN ({placeholders})
+  AND datetime(COALESCE(a.published_at, a.created_at)) >= datetime(?)
+  AND datetime(COALESCE(a.published_at, a.created_at)) < datetime(?)
+ORDER BY ph.poi_id, COALESCE(a.published_at, a.created_at) ASC"""
+
+_UPSERT_POI_ASSESSMENT_SQL = """INSERT INTO poi_assessments
+(poi_id, window_start, window_end, fixation, energy_burst, leakage, pathway,
+ targeting_specificity, tas_score, evidence_json, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+ON CONFLICT(poi_id, window_start, window_end) DO UPDATE SET
+    fixation = excluded.fixation,
+    energy_burst = excluded.energy_burst,
+    leakage = excluded.leakage,
+    pathway = excluded.pathway,
+    targeting_specificity = excluded.targeting_specificity,
+    tas_score = excluded.tas_score,
+    evidence_json = excluded.evidence_json,
+    created_at = CURRENT_TIMESTAMP"""
+
+
+def _assess_poi_rows(poi_id, rows, window_start, window_end, window_days, n, today):
     day_counts = defaultdict(int)
     leakage = pathway = targeting_specificity = False
     excerpts = []
 
     for row in rows:
         day_counts[row["day"]] += 1
+        if row["context"] and len(excerpts) < 3:
+            excerpts.append(row["context"])
+        # Flags only ever latch on; once all three are set the rest of the
+        # window needs no regex work.
+        if leakage and pathway and targeting_specificity:
+            continue
         text = f"{row['title'] or ''} {row['content'] or ''}"
-        if any(pattern.search(text) for pattern in LEAKAGE_PATTERNS):
+        if not leakage and _LEAKAGE_SCAN.search(text):
             leakage = True
-        if any(pattern.search(text) for pattern in PATHWAY_PATTERNS):
+        if not pathway and _PATHWAY_SCAN.search(text):
             pathway = True
-        if row["has_location"] and any(pattern.search(text) for pattern in TARGETING_TIME_PATTERNS):
+        if not targeting_specificity and row["has_location"] and _TARGETING_TIME_SCAN.search(text):
             targeting_specificity = True
-        if row["context"] and len(excerpts) < 3:
-            excerpts.append(row["context"])
 
     distinct_days = len(day_counts)
     ordered_days = sorted(day_counts)
@@ -112,7 +139,7 @@ def compute_poi_assessment(conn, poi_id, window_days=14, n=500):
     second_half = sum(day_counts[d] for d in ordered_days[split:])
     fixation = distinct_days >= 3 and second_half > first_half
 
-    energy_burst, energy_z = _compute_energy_burst(day_counts)
+    energy_burst, energy_z = _compute_energy_burst(day_counts, ordered_days, today)
 
     tas_score = 0.0
     tas_score += 25.0 if fixation else 0.0
@@ -122,7 +149,7 @@ def compute_poi_assessment(conn, poi_id, window_days=14, n=500):
     tas_score += 15.0 if targeting_specificity else 0.0
     tas_score = min(100.0, round(tas_score, 3))
 
-    alpha, beta = _source_beta_for_poi(conn, poi_id, window_start, window_end)
+    alpha, beta = _source_beta_from_rows(rows)
     interval = beta_adjusted_interval(base_score=tas_score, alpha=alpha, beta=beta, n=n, seed=poi_id)
 
     evidence = {
@@ -134,34 +161,6 @@ def compute_poi_assessment(conn, poi_id, window_days=14, n=500):
         "interval": interval,
     }
 
-    conn.execute(
-        """INSERT INTO poi_assessments
-        (poi_id, window_start, window_end, fixation, energy_burst, leakage, pathway,
-         targeting_specificity, tas_score, evidence_json, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(poi_id, window_start, window_end) DO UPDATE SET
-            fixation = excluded.fixation,
-            energy_burst = excluded.energy_burst,
-            leakage = excluded.leakage,
-            pathway = excluded.pathway,
-            targeting_specificity = excluded.targeting_specificity,
-            tas_score = excluded.tas_score,
-            evidence_json = excluded.evidence_json,
-            created_at = CURRENT_TIMESTAMP""",
-        (
-            poi_id,
-            window_start,
-            window_end,
-            int(fixation),
-            int(energy_burst),
-            int(leakage),
-            int(pathway),
-            int(targeting_specificity),
-            tas_score,
-            json.dumps(evidence),
-        ),
-    )
-
     return {
         "poi_id": poi_id,
         "window_start": window_start,
@@ -176,6 +175,57 @@ def compute_poi_assessment(conn, poi_id, window_days=14, n=500):
     }
 
 
+def compute_poi_assessments_bulk(conn, poi_ids, window_days=14, n=500):
+    """
+    compute_poi_assessment() for many POIs with one hit query and one upsert.
+
+    Returns {poi_id: assessment}; POIs without hits in the window are omitted.
+    Upserts share the caller's transaction.
+    """
+    poi_ids = list(dict.fromkeys(poi_ids))
+    if not poi_ids:
+        return {}
+    # One clock read per call: every POI shares the window and "today".
+    now = utcnow()
+    window_start, window_end = _assessment_window_bounds(window_days, now=now)
+    today = (now - _EPOCH).days
+
+    rows = conn.execute(
+        _POI_WINDOW_HITS_SQL.format(placeholders=",".join("?" * len(poi_ids))),
+        (*poi_ids, window_start, window_end),
+    ).fetchall()
+
+    assessments = {
+        poi_id: _assess_poi_rows(
+            poi_id, list(poi_rows), window_start, window_end, window_days, n, today
+        )
+        for poi_id, poi_rows in groupby(rows, key=itemgetter("poi_id"))
+    }
+    conn.executemany(
+        _UPSERT_POI_ASSESSMENT_SQL,
+        [
+            (
+                poi_id,
+                window_start,
+                window_end,
+                assessment["fixation"],
+                assessment["energy_burst"],
+                assessment["leakage"],
+                assessment["pathway"],
+                assessment["targeting_specificity"],
+                assessment["tas_score"],
+                json.dumps(assessment["evidence"]),
+            )
+            for poi_id, assessment in assessments.items()
+        ],
+    )
+    return assessments
+
+
+def compute_poi_assessment(conn, poi_id, window_days=14, n=500):
+    return compute_poi_assessments_bulk(conn, [poi_id], window_days=window_days, n=n).get(poi_id)
+
+
 FLAG_DESCRIPTIONS = {
     "fixation": "Persistent, recurring attention to the protectee across multiple days — indicates obsessive focus.",
     "energy_burst": "Sudden spike in mention frequency (z ≥ 2.0 vs 7-day baseline) — suggests escalating urgency.",
@@ -184,15 +234,37 @@ FLAG_DESCRIPTIONS = {
     "targeting_specificity": "Combination of location data + time references — indicates specific targeting window.",
 }
 
+# (flag, description, display label), in FLAG_DESCRIPTIONS order.
+_FLAG_TABLE = tuple(
+    (flag, description, flag.replace("_", " ")) for flag, description in FLAG_DESCRIPTIONS.items()
+)
+
+
+# Parsed escalation tiers, keyed on the config file's mtime.
+_TIERS_CACHE = {"mtime": None, "tiers": None}
+
+
+def _index_tiers(tiers):
+    """Sort tiers by descending threshold and pair them with the ascending
+    threshold list that _resolve_escalation_tier() bisects."""
+    tiers = sorted(tiers, key=lambda t: t.get("threshold", 0), reverse=True)
+    return tiers, [tier.get("threshold", 0) for tier in reversed(tiers)]
+
 
 def _load_escalation_tiers():
-    """Load escalation tier config from watchlist.yaml."""
+    """Load escalation tiers from watchlist.yaml as ``(tiers, thresholds)``.
+
+    The parsed tiers are reused until the file's mtime changes.
+    """
     try:
+        mtime = os.stat(WATCHLIST_CONFIG_PATH).st_mtime_ns
+        if mtime == _TIERS_CACHE["mtime"]:
+            return _TIERS_CACHE["tiers"]
         with open(WATCHLIST_CONFIG_PATH, "r") as fh:
             config = yaml.safe_load(fh) or {}
-        return config.get("escalation_tiers", [])
+        tiers = config.get("escalation_tiers", [])
     except (OSError, yaml.YAMLError, AttributeError):
-        return [
+        return _index_tiers([
             {"threshold": 85, "label": "CRITICAL", "notify": ["detail_leader", "intel_manager"],
              "action": "Immediate briefing required.", "response_window": "30 minutes"},
             {"threshold": 65, "label": "ELEVATED", "notify": ["intel_analyst"],
@@ -201,19 +273,22 @@ def _load_escalation_tiers():
              "action": "Log and monitor.", "response_window": "24 hours"},
             {"threshold": 0, "label": "LOW", "notify": [],
              "action": "No immediate action.", "response_window": "N/A"},
-        ]
+        ])
+    _TIERS_CACHE["mtime"], _TIERS_CACHE["tiers"] = mtime, _index_tiers(tiers or [])
+    return _TIERS_CACHE["tiers"]
 
 
 def _resolve_escalation_tier(score):
     """Map a TAS score to the appropriate escalation tier."""
-    tiers = _load_escalation_tiers()
+    tiers, thresholds = _load_escalation_tiers()
     if not tiers:
         return {"label": "ROUTINE", "notify": [], "action": "Monitor.", "response_window": "24 hours"}
-    tiers_sorted = sorted(tiers, key=lambda t: t.get("threshold", 0), reverse=True)
-    for tier in tiers_sorted:
-        if score >= tier.get("threshold", 0):
-            return tier
-    return tiers_sorted[-1] if tiers_sorted else {"label": "LOW", "notify": [], "action": "Archive."}
+    # Highest tier whose threshold the score reaches; below every threshold
+    # falls through to the lowest tier. Copied so callers can't edit the cache.
+    tier = dict(tiers[min(len(tiers) - bisect_right(thresholds, score), len(tiers) - 1)])
+    if "notify" in tier:
+        tier["notify"] = list(tier["notify"])
+    return tier
 
 
 def build_escalation_explanation(assessment):
@@ -231,9 +306,11 @@ def build_escalation_explanation(assessment):
     tier = _resolve_escalation_tier(tas_score)
 
     flags_fired = []
-    for flag_name, description in FLAG_DESCRIPTIONS.items():
+    flag_labels = []
+    for flag_name, description, label in _FLAG_TABLE:
         if int(assessment.get(flag_name, 0)) == 1:
             flags_fired.append({"flag": flag_name, "description": description})
+            flag_labels.append(label)
 
     evidence = assessment.get("evidence") or {}
     excerpts = evidence.get("excerpts", [])
@@ -253,22 +330,21 @@ def build_escalation_explanation(assessment):
         "recommended_actions": actions,
         "response_window": tier.get("response_window", "N/A"),
         "notify": tier.get("notify", []),
-        "summary": _build_escalation_summary(tas_score, flags_fired, evidence, tier),
+        "summary": _build_escalation_summary(tas_score, flag_labels, evidence, tier),
     }
 
 
-def _build_escalation_summary(tas_score, flags_fired, evidence, tier):
+def _build_escalation_summary(tas_score, flag_labels, evidence, tier):
     """One-paragraph human-readable escalation summary."""
-    if not flags_fired:
+    if not flag_labels:
         return f"TAS {tas_score:.1f} — No TRAP-lite flags active. {tier.get('action', 'Monitor.')}."
 
-    flag_names = [f["flag"].replace("_", " ") for f in flags_fired]
     hit_count = evidence.get("hits", 0)
     day_count = evidence.get("distinct_days", 0)
 
     summary = (
         f"Escalate: TAS {tas_score:.1f} ({tier.get('label', 'ROUTINE')}). "
-        f"TRAP-lite flags: {', '.join(flag_names)}. "
+        f"TRAP-lite flags: {', '.join(flag_labels)}. "
         f"{hit_count} hit(s) across {day_count} day(s). "
     )
     if tier.get("response_window"):
@@ -285,11 +361,9 @@ def update_alert_tas(conn, alert_id):
         conn.execute("UPDATE alerts SET tas_score = 0.0 WHERE id = ?", (alert_id,))
         return {"alert_id": alert_id, "tas_score": 0.0, "pois": []}
 
-    assessments = []
-    for row in poi_rows:
-        assessment = compute_poi_assessment(conn, row["poi_id"], window_days=14)
-        if assessment:
-            assessments.append(assessment)
+    poi_ids = [row["poi_id"] for row in poi_rows]
+    by_poi = compute_poi_assessments_bulk(conn, poi_ids, window_days=14)
+    assessments = [by_poi[poi_id] for poi_id in poi_ids if poi_id in by_poi]
 
     tas_score = max((a["tas_score"] for a in assessments), default=0.0)
     conn.execute("UPDATE alerts SET tas_score = ? WHERE id = ?", (float(tas_score), alert_id))
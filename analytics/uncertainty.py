@@ -1,25 +1,24 @@
-import math
-import random
+import hashlib
 from datetime import timedelta
 
+import numpy as np
+
 from analytics.utils import compute_recency_factor, parse_timestamp, utcnow
 from database.init_db import get_connection
 
 
-def _percentile(sorted_values, q):
-    if not sorted_values:
-        return 0.0
-    if q <= 0:
-        return sorted_values[0]
-    if q >= 1:
-        return sorted_values[-1]
-    idx = (len(sorted_values) - 1) * q
-    lower = math.floor(idx)
-    upper = math.ceil(idx)
-    if lower == upper:
-        return sorted_values[lower]
-    weight = idx - lower
-    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+def _summarize(samples, method):
+    """Summary statistics for a 1-D array of clamped score samples."""
+    p05, p50, p95 = np.quantile(samples, [0.05, 0.50, 0.95])
+    return {
+        "n": int(samples.size),
+        "mean": round(float(samples.mean()), 3),
+        "std": round(float(samples.std()), 3),
+        "p05": round(float(p05), 3),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "method": method,
+    }
 
 
 def score_distribution(
@@ -40,7 +39,7 @@ def score_distribution(
     if n <= 0:
         raise ValueError("n must be > 0")
 
-    rng = random.Random(seed)
+    rng = np.random.default_rng(seed)
     safe_alpha = max(float(alpha or 0), 0.01)
     safe_beta = max(float(beta or 0), 0.01)
     safe_sigma = max(float(keyword_sigma or 0), 0.01)
@@ -48,27 +47,12 @@ def score_distribution(
     safe_freq = float(freq_factor or 1.0)
     safe_recency = float(recency_factor or 0.1)
 
-    samples = []
-    for _ in range(n):
-        cred = rng.betavariate(safe_alpha, safe_beta)
-        sampled_weight = min(5.0, max(0.1, rng.gauss(safe_weight, safe_sigma)))
-        score = (sampled_weight * safe_freq * cred * 20.0) + (safe_recency * 10.0)
-        score += float(additive_boost or 0.0)
-        samples.append(max(0.0, min(100.0, score)))
-
-    samples.sort()
-    mean = sum(samples) / len(samples)
-    variance = sum((x - mean) ** 2 for x in samples) / len(samples)
-
-    return {
-        "n": n,
-        "mean": round(mean, 3),
-        "std": round(math.sqrt(variance), 3),
-        "p05": round(_percentile(samples, 0.05), 3),
-        "p50": round(_percentile(samples, 0.50), 3),
-        "p95": round(_percentile(samples, 0.95), 3),
-        "method": "monte_carlo_beta_normal_v1",
-    }
+    # All n draws at once; same model as the per-sample loop it replaces.
+    cred = rng.beta(safe_alpha, safe_beta, n)
+    sampled_weight = np.clip(rng.normal(safe_weight, safe_sigma, n), 0.1, 5.0)
+    scores = (sampled_weight * safe_freq * cred * 20.0) + (safe_recency * 10.0)
+    scores += float(additive_boost or 0.0)
+    return _summarize(np.clip(scores, 0.0, 100.0), "monte_carlo_beta_normal_v1")
 
 
 def beta_adjusted_interval(base_score, alpha, beta, n=500, seed=0):
@@ -79,41 +63,39 @@ def beta_adjusted_interval(base_score, alpha, beta, n=500, seed=0):
     """
     if n <= 0:
         raise ValueError("n must be > 0")
-    rng = random.Random(seed)
+    rng = np.random.default_rng(seed)
     safe_alpha = max(float(alpha or 0), 0.01)
     safe_beta = max(float(beta or 0), 0.01)
     safe_base = max(0.0, min(100.0, float(base_score or 0.0)))
 
-    samples = []
-    for _ in range(n):
-        cred = rng.betavariate(safe_alpha, safe_beta)
-        multiplier = 0.5 + cred
-        samples.append(max(0.0, min(100.0, safe_base * multiplier)))
+    multiplier = 0.5 + rng.beta(safe_alpha, safe_beta, n)
+    return _summarize(np.clip(safe_base * multiplier, 0.0, 100.0), "beta_adjusted_score_v1")
 
-    samples.sort()
-    mean = sum(samples) / len(samples)
-    variance = sum((x - mean) ** 2 for x in samples) / len(samples)
-    return {
-        "n": n,
-        "mean": round(mean, 3),
-        "std": round(math.sqrt(variance), 3),
-        "p05": round(_percentile(samples, 0.05), 3),
-        "p50": round(_percentile(samples, 0.50), 3),
-        "p95": round(_percentile(samples, 0.95), 3),
-        "method": "beta_adjusted_score_v1",
-    }
+
+def _inputs_hash(*inputs):
+    """Stable fingerprint of the Monte Carlo inputs (floats rounded to 6 dp)."""
+    key = repr(tuple(round(float(v), 6) if isinstance(v, float) else v for v in inputs))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
 
 
 def compute_uncertainty_for_alert(alert_id, n=500, seed=None, force=False, cache_hours=6):
     """Compute and cache uncertainty intervals in alert_score_intervals.
 
+    The interval is a pure function of its inputs and seed, so a cached row is
+    reused whenever its ``inputs_hash`` matches the alert's current inputs
+    (regardless of age) and recomputed as soon as any input changes. Alerts
+    with no stored score take recency from the clock; for those the hash
+    leaves recency out and the row is also subject to ``cache_hours``.
+
     Args:
         alert_id: The alert to compute uncertainty for.
         n: Number of Monte Carlo samples.
         seed: RNG seed. Defaults to ``alert_id`` so each alert gets a
               unique-but-reproducible distribution.
-        force: Recompute even if a fresh cached result exists.
-        cache_hours: Cache TTL in hours.
+        force: Recompute even if a cached result matches.
+        cache_hours: Cache TTL in hours for rows whose recency is clock-derived
+              or that were written before inputs were fingerprinted
+              (``inputs_hash`` is NULL).
     """
     from analytics.risk_scoring import get_frequency_factor
 
@@ -126,40 +108,41 @@ def compute_uncertainty_for_alert(alert_id, n=500, seed=None, force=False, cache
             "SELECT * FROM alert_score_intervals WHERE alert_id = ?",
             (alert_id,),
         ).fetchone()
+        is_fresh = False
         if cached and not force:
             computed_dt = parse_timestamp(cached["computed_at"])
             is_fresh = computed_dt and (utcnow() - computed_dt) < timedelta(hours=cache_hours)
-            if is_fresh and int(cached["n"]) == int(n):
-                return dict(cached)
+            if cached["inputs_hash"] is None and is_fresh and int(cached["n"]) == int(n):
+                return _cached_interval(cached)
 
+        # Alert inputs and its latest stored score in one round trip.
         row = conn.execute(
             """SELECT a.id, a.keyword_id, a.created_at, a.published_at,
-                      k.weight, k.weight_sigma, s.bayesian_alpha, s.bayesian_beta
+                      k.weight, k.weight_sigma, s.bayesian_alpha, s.bayesian_beta,
+                      sc.id AS score_id, sc.frequency_factor, sc.recency_factor,
+                      sc.category_factor, sc.proximity_factor, sc.event_factor, sc.poi_factor
             FROM alerts a
             JOIN keywords k ON a.keyword_id = k.id
             JOIN sources s ON a.source_id = s.id
+            LEFT JOIN alert_scores sc ON sc.id = (
+                SELECT id FROM alert_scores WHERE alert_id = a.id
+                ORDER BY computed_at DESC LIMIT 1
+            )
             WHERE a.id = ?""",
             (alert_id,),
         ).fetchone()
         if not row:
             raise ValueError("Alert not found")
 
-        latest_score = conn.execute(
-            """SELECT frequency_factor, recency_factor,
-                      category_factor, proximity_factor, event_factor, poi_factor
-            FROM alert_scores WHERE alert_id = ?
-            ORDER BY computed_at DESC LIMIT 1""",
-            (alert_id,),
-        ).fetchone()
-
-        if latest_score:
-            freq_factor = latest_score["frequency_factor"]
-            recency_factor = latest_score["recency_factor"]
+        has_score = row["score_id"] is not None
+        if has_score:
+            freq_factor = row["frequency_factor"]
+            recency_factor = row["recency_factor"]
             additive_boost = (
-                float(latest_score["category_factor"] or 0.0)
-                + float(latest_score["proximity_factor"] or 0.0)
-                + float(latest_score["event_factor"] or 0.0)
-                + float(latest_score["poi_factor"] or 0.0)
+                float(row["category_factor"] or 0.0)
+                + float(row["proximity_factor"] or 0.0)
+                + float(row["event_factor"] or 0.0)
+                + float(row["poi_factor"] or 0.0)
             )
         else:
             freq_factor, _ = get_frequency_factor(conn, row["keyword_id"])
@@ -175,6 +158,23 @@ def compute_uncertainty_for_alert(alert_id, n=500, seed=None, force=False, cache
         alpha = row["bayesian_alpha"] if row["bayesian_alpha"] else 2.0
         beta = row["bayesian_beta"] if row["bayesian_beta"] else 2.0
 
+        # Clock-derived recency changes on every call, so it is left out of the
+        # fingerprint and bounded by cache_hours instead.
+        inputs_hash = _inputs_hash(
+            keyword_weight,
+            keyword_sigma,
+            freq_factor,
+            recency_factor if has_score else None,
+            alpha,
+            beta,
+            additive_boost,
+            int(n),
+            seed,
+        )
+        if cached and not force and cached["inputs_hash"] == inputs_hash:
+            if has_score or is_fresh:
+                return _cached_interval(cached)
+
         interval = score_distribution(
             keyword_weight=keyword_weight,
             keyword_sigma=keyword_sigma,
@@ -190,8 +190,8 @@ def compute_uncertainty_for_alert(alert_id, n=500, seed=None, force=False, cache
         computed_at = utcnow().strftime("%Y-%m-%d %H:%M:%S")
         conn.execute(
             """INSERT INTO alert_score_intervals
-            (alert_id, n, p05, p50, p95, mean, std, computed_at, method)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            (alert_id, n, p05, p50, p95, mean, std, computed_at, method, inputs_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(alert_id) DO UPDATE SET
                 n = excluded.n,
                 p05 = excluded.p05,
@@ -200,7 +200,8 @@ def compute_uncertainty_for_alert(alert_id, n=500, seed=None, force=False, cache
                 mean = excluded.mean,
                 std = excluded.std,
                 computed_at = excluded.computed_at,
-                method = excluded.method""",
+                method = excluded.method,
+                inputs_hash = excluded.inputs_hash""",
             (
                 alert_id,
                 interval["n"],
@@ -211,6 +212,7 @@ def compute_uncertainty_for_alert(alert_id, n=500, seed=None, force=False, cache
                 interval["std"],
                 computed_at,
                 interval["method"],
+                inputs_hash,
             ),
         )
         conn.commit()
@@ -219,3 +221,10 @@ def compute_uncertainty_for_alert(alert_id, n=500, seed=None, force=False, cache
         return interval
     finally:
         conn.close()
+
+
+def _cached_interval(row):
+    """Cached alert_score_intervals row in the shape compute returns."""
+    interval = dict(row)
+    interval.pop("inputs_hash", None)
+    return interval
@@ -6,6 +6,7 @@ divergent copies across modules.
 """
 
 from datetime import datetime, timezone
+from functools import lru_cache
 
 
 def utcnow():
@@ -30,36 +31,48 @@ def parse_timestamp(value):
     if not value:
         return None
     if isinstance(value, datetime):
-        dt = value
-    else:
-        raw = str(value).strip()
-        if not raw:
+        return _to_naive_utc(value)
+    return _parse_timestamp_str(str(value).strip())
+
+
+@lru_cache(maxsize=8192)
+def _parse_timestamp_str(raw):
+    """String branch of parse_timestamp(); memoized because alert timestamps
+    repeat heavily across a rescore and datetimes are immutable."""
+    if not raw:
+        return None
+    try:
+        dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+            try:
+                dt = datetime.strptime(raw, fmt)
+                break
+            except ValueError:
+                dt = None
+        if dt is None:
             return None
-        try:
-            dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
-        except ValueError:
-            for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
-                try:
-                    dt = datetime.strptime(raw, fmt)
-                    break
-                except ValueError:
-                    dt = None
-            if dt is None:
-                return None
+    return _to_naive_utc(dt)
+
+
+def _to_naive_utc(dt):
     if dt.tzinfo is not None:
         return dt.astimezone(timezone.utc).replace(tzinfo=None)
     return dt
 
 
-def compute_recency_factor(published_at=None, created_at=None):
+def compute_recency_factor(published_at=None, created_at=None, now=None):
     """Compute a recency factor and the underlying recency_hours.
 
+    ``now`` lets a scoring cycle read the clock once and reuse it per alert.
+
     Returns:
         ``(recency_factor, recency_hours)`` tuple.
         ``recency_factor`` decays linearly from 1.0 (now) to 0.1 (168 h).
         Future-dated events are clamped to 0 hours (treated as "just now")
         to prevent score inflation from feeds with future timestamps.
     """
-    event_dt = parse_timestamp(published_at) or parse_timestamp(created_at) or utcnow()
-    recency_hours = max(0.0, (utcnow() - event_dt).total_seconds() / 3600.0)
+    now = now or utcnow()
+    event_dt = parse_timestamp(published_at) or parse_timestamp(created_at) or now
+    recency_hours = max(0.0, (now - event_dt).total_seconds() / 3600.0)
     return max(0.1, 1.0 - (recency_hours / 168.0)), recency_hours
@@ -1,7 +1,10 @@
 import json
 import os
 import html
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timezone
+from functools import partial
 
 import pandas as pd
 import plotly.express as px
@@ -9,6 +12,7 @@ import plotly.graph_objects as go
 import plotly.io as pio
 import requests
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # ---------------------------------------------------------------------------
 # API helpers
@@ -23,23 +27,34 @@ def _hdrs():
     return {"X-API-Key": API_KEY} if API_KEY else {}
 
 
+@st.cache_resource(show_spinner=False)
+def _session():
+    """Keep-alive HTTP session shared across reruns, so API calls reuse pooled connections."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(_hdrs())
+    return session
+
+
 def _get(path, params=None, timeout=20):
-    r = requests.get(f"{API_URL}{path}", params=params, headers=_hdrs(), timeout=timeout)
+    r = _session().get(f"{API_URL}{path}", params=params, timeout=timeout)
     r.raise_for_status()
     return r.json()
 
 
 def _post(path, payload=None, timeout=30):
-    r = requests.post(f"{API_URL}{path}", json=payload, headers=_hdrs(), timeout=timeout)
+    r = _session().post(f"{API_URL}{path}", json=payload, timeout=timeout)
     r.raise_for_status()
     return r.json()
 
 
 def _patch(path, payload=None, timeout=20):
-    kw = {"headers": _hdrs(), "timeout": timeout}
+    kw = {"timeout": timeout}
     if payload is not None:
         kw["json"] = payload
-    r = requests.patch(f"{API_URL}{path}", **kw)
+    r = _session().patch(f"{API_URL}{path}", **kw)
     r.raise_for_status()
     return r.json()
 
@@ -147,6 +162,37 @@ def fetch_investigation_threads(days=14, window_hours=72, min_cluster_size=2, li
         },
     )
 
+@st.cache_data(ttl=120, show_spinner=False)
+def fetch_alert_score(alert_id, n=500):
+    return _get(f"/alerts/{alert_id}/score", params={"uncertainty": 1, "n": n})
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_keyword_forecast(keyword_id, horizon=7):
+    return _get(f"/analytics/forecast/keyword/{keyword_id}", params={"horizon": horizon})
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_backtest():
+    return _get("/analytics/backtest")
+
+
+def _prefetch(*fetchers):
+    """Run independent cached fetchers concurrently to warm st.cache_data.
+
+    Errors are left for the rendering code, which calls the same fetcher again
+    and shows its own fallback.
+    """
+    ctx = get_script_run_ctx()
+
+    def _run(fetcher):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        try:
+            fetcher()
+        except requests.RequestException:
+            pass
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(_run, fetchers))
+
 
 # ---------------------------------------------------------------------------
 # Plotly dark template
@@ -176,6 +222,60 @@ def _style(fig, height=None):
     return fig
 
 
+# Figures that depend only on fetched data are cached like the fetches; a
+# cache hit unpickles the figure instead of re-running Plotly's layout.
+@st.cache_data(ttl=120, show_spinner=False)
+def _spike_figure(spike_rows, template):
+    """spike_rows: tuple of (term, spike_ratio, today_count)."""
+    terms, ratios, today = zip(*spike_rows)
+    fig = px.bar(x=list(terms), y=list(ratios), color=list(today),
+                 color_continuous_scale=[[0, "#1e3a5f"], [1, "#3b82f6"]],
+                 labels={"x": "Keyword", "y": "Spike Ratio", "color": "Today"})
+    fig.update_layout(template=template, height=320)
+    return fig
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _forecast_figure(history, forecast, method, template):
+    """history: tuple of (date, count); forecast: tuple of (date, yhat, lo, hi)."""
+    fig = go.Figure()
+    if history:
+        fig.add_trace(go.Scatter(
+            x=[h[0] for h in history], y=[h[1] for h in history],
+            mode="lines+markers", name="Historical", line=dict(color="#3b82f6", width=2),
+            marker=dict(size=5),
+        ))
+    if forecast:
+        fig.add_trace(go.Scatter(
+            x=[f[0] for f in forecast], y=[f[1] for f in forecast],
+            mode="lines+markers", name="Forecast", line=dict(color="#f97316", width=2, dash="dash"),
+            marker=dict(size=5),
+        ))
+        fig.add_trace(go.Scatter(
+            x=[f[0] for f in forecast] + [f[0] for f in reversed(forecast)],
+            y=[f[3] for f in forecast] + [f[2] for f in reversed(forecast)],
+            fill="toself", fillcolor="rgba(249,115,22,0.08)",
+            line=dict(width=0), name="95% CI",
+        ))
+    fig.update_layout(title=f"7-Day Forecast ({method})", template=template, height=300)
+    return fig
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _credibility_figure(ranked, template):
+    """ranked: tuple of (name, credibility_score), lowest credibility first."""
+    names, scores = zip(*ranked)
+    fig = px.bar(
+        x=list(scores), y=list(names), orientation="h",
+        color=list(scores),
+        color_continuous_scale=[[0, "#ef4444"], [0.5, "#eab308"], [1, "#22c55e"]],
+        range_color=[0, 1],
+        labels={"x": "Credibility", "y": "Source", "color": "Credibility"},
+    )
+    fig.update_layout(template=template, height=320)
+    return fig
+
+
 # ---------------------------------------------------------------------------
 # Design tokens
 # ---------------------------------------------------------------------------
@@ -379,7 +479,7 @@ st.markdown(
 
 # API health check
 try:
-    requests.get(f"{API_URL}/", headers=_hdrs(), timeout=3).raise_for_status()
+    _session().get(f"{API_URL}/", timeout=3).raise_for_status()
 except requests.RequestException:
     st.error("\u26A0\uFE0F Cannot connect to API. Start the server: `make api`")
     st.stop()
@@ -516,12 +616,14 @@ with tabs[0]:
             st.markdown("##### Severity Distribution")
             by_sev = summary.get("by_severity", {})
             if by_sev:
-                sev_df = pd.DataFrame(list(by_sev.items()), columns=["Severity", "Count"])
                 order = ["critical", "high", "medium", "low"]
-                sev_df["Severity"] = pd.Categorical(sev_df["Severity"], categories=order, ordered=True)
-                sev_df = sev_df.sort_values("Severity")
-                fig = px.bar(sev_df, x="Severity", y="Count", color="Severity", color_discrete_map=SEVERITY_COLORS)
-                fig.update_layout(showlegend=False)
+                severities = [s for s in order if s in by_sev] + [s for s in by_sev if s not in order]
+                fig = go.Figure(go.Bar(
+                    x=severities,
+                    y=[by_sev[s] for s in severities],
+                    marker_color=[SEVERITY_COLORS.get(s, "#64748b") for s in severities],
+                ))
+                fig.update_layout(showlegend=False, xaxis_title="Severity", yaxis_title="Count")
                 _style(fig, 280)
                 st.plotly_chart(fig, use_container_width=True)
             else:
@@ -531,10 +633,14 @@ with tabs[0]:
             st.markdown("##### Top Keywords")
             top_kw = summary.get("top_keywords", {})
             if top_kw:
-                kw_df = pd.DataFrame(list(top_kw.items()), columns=["Keyword", "Count"])
-                kw_df = kw_df.sort_values("Count", ascending=True).tail(10)
-                fig = px.bar(kw_df, x="Count", y="Keyword", orientation="h", color_discrete_sequence=["#3b82f6"])
-                fig.update_layout(showlegend=False)
+                kw_items = sorted(top_kw.items(), key=lambda item: item[1])[-10:]
+                fig = go.Figure(go.Bar(
+                    x=[count for _, count in kw_items],
+                    y=[term for term, _ in kw_items],
+                    orientation="h",
+                    marker_color="#3b82f6",
+                ))
+                fig.update_layout(showlegend=False, xaxis_title="Count", yaxis_title="Keyword")
                 _style(fig, 280)
                 st.plotly_chart(fig, use_container_width=True)
             else:
@@ -544,11 +650,15 @@ with tabs[0]:
             st.markdown("##### Emerging Themes")
             themes = report.get("emerging_themes", [])
             if themes:
-                th_df = pd.DataFrame(themes)
-                y_col = "term" if "term" in th_df.columns else "keyword" if "keyword" in th_df.columns else None
-                x_col = "spike_ratio" if "spike_ratio" in th_df.columns else "z_score" if "z_score" in th_df.columns else None
+                theme_cols = set().union(*themes)
+                y_col = "term" if "term" in theme_cols else "keyword" if "keyword" in theme_cols else None
+                x_col = "spike_ratio" if "spike_ratio" in theme_cols else "z_score" if "z_score" in theme_cols else None
                 if y_col and x_col:
-                    fig = px.bar(th_df, x=x_col, y=y_col, orientation="h", color_discrete_sequence=["#06b6d4"])
+                    fig = px.bar(
+                        x=[t.get(x_col) for t in themes], y=[t.get(y_col) for t in themes],
+                        orientation="h", color_discrete_sequence=["#06b6d4"],
+                        labels={"x": x_col, "y": y_col},
+                    )
                     fig.update_layout(showlegend=False)
                     _style(fig, 280)
                     st.plotly_chart(fig, use_container_width=True)
@@ -653,7 +763,7 @@ with tabs[1]:
 
                     # Score decomposition
                     try:
-                        score_data = _get(f"/alerts/{sel_id}/score", params={"uncertainty": 1, "n": 500})
+                        score_data = fetch_alert_score(sel_id)
                         st.markdown("**Score Decomposition**")
                         s1, s2, s3 = st.columns(3)
                         s1.metric("Keyword Wt", f"{score_data.get('keyword_weight', 0):.1f}")
@@ -977,6 +1087,25 @@ with tabs[3]:
         st.cache_data.clear()
         st.rerun()
 
+    # Independent reads for this tab, fetched together; the sections below
+    # then hit the cache. The forecast waits on the keyword selectbox.
+    _prefetch(
+        partial(fetch_insider_risk, min_score=irs_min, limit=30),
+        partial(fetch_supply_chain_risk, min_score=vendor_min, limit=30),
+        partial(
+            fetch_investigation_threads,
+            days=thread_days,
+            window_hours=72,
+            min_cluster_size=2,
+            limit=20,
+        ),
+        partial(fetch_spikes, threshold=1.5),
+        fetch_keywords,
+        partial(fetch_graph_data, days=14, min_score=40, limit=200),
+        fetch_sources,
+        fetch_backtest,
+    )
+
     try:
         insider_rows = fetch_insider_risk(min_score=irs_min, limit=30)
     except requests.RequestException:
@@ -1081,13 +1210,12 @@ with tabs[3]:
         try:
             spikes = fetch_spikes(threshold=1.5)
             if spikes:
-                spike_df = pd.DataFrame(spikes)
-                fig = px.bar(spike_df, x="term", y="spike_ratio", color="today_count",
-                             color_continuous_scale=[[0, "#1e3a5f"], [1, "#3b82f6"]],
-                             labels={"term": "Keyword", "spike_ratio": "Spike Ratio", "today_count": "Today"})
-                _style(fig, 320)
+                fig = _spike_figure(
+                    tuple((r["term"], r["spike_ratio"], r["today_count"]) for r in spikes),
+                    ACTIVE_TEMPLATE_NAME,
+                )
                 st.plotly_chart(fig, use_container_width=True)
-                st.dataframe(spike_df, use_container_width=True, hide_index=True)
+                st.dataframe(pd.DataFrame(spikes), use_container_width=True, hide_index=True)
             else:
                 _empty("No keyword spikes above threshold. Needs 3+ days of scraping history.", "\U0001F4C8")
         except requests.RequestException:
@@ -1103,34 +1231,19 @@ with tabs[3]:
                 if selected_kw:
                     kw_id = kw_map[selected_kw]
                     try:
-                        fc_data = _get(f"/analytics/forecast/keyword/{kw_id}", params={"horizon": 7})
+                        fc_data = fetch_keyword_forecast(kw_id)
                         history = fc_data.get("history", [])
                         forecast = fc_data.get("forecast", [])
                         method = fc_data.get("method", "unknown")
                         quality = fc_data.get("quality", {})
 
                         if history or forecast:
-                            fig = go.Figure()
-                            if history:
-                                fig.add_trace(go.Scatter(
-                                    x=[h["date"] for h in history], y=[h["count"] for h in history],
-                                    mode="lines+markers", name="Historical", line=dict(color="#3b82f6", width=2),
-                                    marker=dict(size=5),
-                                ))
-                            if forecast:
-                                fig.add_trace(go.Scatter(
-                                    x=[f["date"] for f in forecast], y=[f["yhat"] for f in forecast],
-                                    mode="lines+markers", name="Forecast", line=dict(color="#f97316", width=2, dash="dash"),
-                                    marker=dict(size=5),
-                                ))
-                                fig.add_trace(go.Scatter(
-                                    x=[f["date"] for f in forecast] + [f["date"] for f in reversed(forecast)],
-                                    y=[f["hi"] for f in forecast] + [f["lo"] for f in reversed(forecast)],
-                                    fill="toself", fillcolor="rgba(249,115,22,0.08)",
-                                    line=dict(width=0), name="95% CI",
-                                ))
-                            fig.update_layout(title=f"7-Day Forecast ({method})")
-                            _style(fig, 300)
+                            fig = _forecast_figure(
+                                tuple((h["date"], h["count"]) for h in history),
+                                tuple((f["date"], f["yhat"], f["lo"], f["hi"]) for f in forecast),
+                                method,
+                                ACTIVE_TEMPLATE_NAME,
+                            )
                             st.plotly_chart(fig, use_container_width=True)
                             smape = quality.get("smape")
                             if smape is not None:
@@ -1221,17 +1334,12 @@ with tabs[3]:
         try:
             sources = fetch_sources()
             if sources:
-                src_df = pd.DataFrame(sources)
-                if "credibility_score" in src_df.columns:
-                    src_df = src_df.sort_values("credibility_score", ascending=True)
-                    fig = px.bar(
-                        src_df, x="credibility_score", y="name", orientation="h",
-                        color="credibility_score",
-                        color_continuous_scale=[[0, "#ef4444"], [0.5, "#eab308"], [1, "#22c55e"]],
-                        range_color=[0, 1],
-                        labels={"credibility_score": "Credibility", "name": "Source"},
+                if all("credibility_score" in s for s in sources):
+                    ranked = sorted(sources, key=lambda s: s["credibility_score"])
+                    fig = _credibility_figure(
+                        tuple((s["name"], s["credibility_score"]) for s in ranked),
+                        ACTIVE_TEMPLATE_NAME,
                     )
-                    _style(fig, 320)
                     st.plotly_chart(fig, use_container_width=True)
         except requests.RequestException:
             _empty("Source data unavailable.")
@@ -1239,7 +1347,7 @@ with tabs[3]:
     with col_bt:
         st.markdown("**Scoring Model Backtest**")
         try:
-            backtest = _get("/analytics/backtest")
+            backtest = fetch_backtest()
             if backtest and backtest.get("cases"):
                 bt1, bt2, bt3 = st.columns(3)
                 bt1.metric("Multi-factor", f"{backtest.get('multifactor_accuracy', 0):.1%}")
@@ -1283,9 +1391,12 @@ with tabs[4]:
         try:
             keywords = fetch_keywords()
             if keywords:
-                kw_df = pd.DataFrame(keywords)
-                cols = [c for c in ["id", "term", "category", "weight", "active"] if c in kw_df.columns]
-                st.dataframe(kw_df[cols], use_container_width=True, hide_index=True)
+                present = set().union(*keywords)
+                cols = [c for c in ["id", "term", "category", "weight", "active"] if c in present]
+                st.dataframe(
+                    [{c: row.get(c) for c in cols} for row in keywords],
+                    use_container_width=True, hide_index=True,
+                )
         except requests.RequestException:
             st.caption("Keyword table unavailable.")
 
@@ -1295,9 +1406,12 @@ with tabs[4]:
         try:
             locations = fetch_locations()
             if locations:
-                loc_df = pd.DataFrame(locations)
-                cols = [c for c in ["name", "type", "lat", "lon", "radius_miles"] if c in loc_df.columns]
-                st.dataframe(loc_df[cols], use_container_width=True, hide_index=True)
+                present = set().union(*locations)
+                cols = [c for c in ["name", "type", "lat", "lon", "radius_miles"] if c in present]
+                st.dataframe(
+                    [{c: row.get(c) for c in cols} for row in locations],
+                    use_container_width=True, hide_index=True,
+                )
         except requests.RequestException:
             st.caption("Protected locations unavailable.")
 
@@ -1389,21 +1503,23 @@ with tabs[4]:
         try:
             sources = fetch_sources()
             if sources:
+                # One markdown element for the whole list rather than one per source.
+                cred_rows = []
                 for src in sources:
                     cred = src.get("credibility_score", 0.5)
                     tp = src.get("true_positives", 0)
                     fp = src.get("false_positives", 0)
                     bar_w = int(cred * 100)
                     bar_color = "#22c55e" if cred >= 0.7 else "#eab308" if cred >= 0.4 else "#ef4444"
-                    st.markdown(
+                    cred_rows.append(
                         f'<div style="margin-bottom:6px;">'
                         f'<span style="color:{UI_TEXT_PRIMARY};font-size:0.82rem;font-weight:600;">{_esc(src["name"])}</span> '
                         f'<span style="color:{UI_TEXT_SECONDARY};font-size:0.72rem;">({_esc(src["source_type"])}) TP:{tp} FP:{fp}</span>'
                         f'<div style="background:#1e293b;border-radius:3px;height:6px;margin-top:3px;">'
                         f'<div style="background:{bar_color};width:{bar_w}%;height:100%;border-radius:3px;"></div>'
-                        f'</div></div>',
-                        unsafe_allow_html=True,
+                        f'</div></div>'
                     )
+                st.markdown("".join(cred_rows), unsafe_allow_html=True)
         except requests.RequestException:
             st.caption("Source credibility data unavailable.")
 
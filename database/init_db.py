@@ -1,6 +1,8 @@
+import copy
 import os
 import sqlite3
 from datetime import datetime, timedelta
+from functools import lru_cache
 from urllib.parse import quote_plus, urlencode
 
 import yaml
@@ -48,12 +50,26 @@ KEYWORD_DEFAULT_WEIGHTS_BY_CATEGORY = {
 }
 
 
+# Database files already switched to WAL by this process. journal_mode is
+# persistent, so it only needs setting once per file.
+_WAL_DB_PATHS = set()
+
+
 def get_connection():
     db_path = _resolve_db_path()
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
+    if db_path not in _WAL_DB_PATHS:
+        conn.execute("PRAGMA journal_mode = WAL")
+        _WAL_DB_PATHS.add(db_path)
+    # WAL is durable across application crashes at synchronous=NORMAL; only the
+    # last commits before a power loss can roll back.
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA mmap_size = 268435456")
     return conn
 
 
@@ -82,7 +98,9 @@ def _get_table_columns(conn, table_name):
     # Validate table_name is a simple identifier to prevent injection
     if not table_name or not table_name.isidentifier():
         raise ValueError(f"Invalid table name: {table_name!r}")
-    return [row["name"] for row in conn.execute(f"PRAGMA table_info({table_name})").fetchall()]
+    # Bound parameter, so sqlite3's statement cache reuses one prepared query.
+    rows = conn.execute("SELECT name FROM pragma_table_info(?)", (table_name,)).fetchall()
+    return [row[0] for row in rows]
 
 
 def _create_alert_entities_v2(conn):
@@ -288,15 +306,24 @@ def migrate_schema():
         "ALTER TABLE alert_scores ADD COLUMN proximity_factor REAL DEFAULT 0.0",
         "ALTER TABLE alert_scores ADD COLUMN event_factor REAL DEFAULT 0.0",
         "ALTER TABLE alert_scores ADD COLUMN poi_factor REAL DEFAULT 0.0",
+        "ALTER TABLE alert_score_intervals ADD COLUMN inputs_hash TEXT",
         "ALTER TABLE threat_actors ADD COLUMN alert_count INTEGER DEFAULT 0",
         "ALTER TABLE intelligence_reports ADD COLUMN top_entities TEXT",
         "ALTER TABLE intelligence_reports ADD COLUMN new_cves TEXT",
     ]
+    # One PRAGMA per table instead of a failing ALTER (and its implicit
+    # transaction) for every column an existing database already has.
+    table_columns = {}
     for sql in migrations:
+        _, _, table, _, _, column = sql.split()[:6]
+        if table not in table_columns:
+            table_columns[table] = set(_get_table_columns(conn, table))
+        if column in table_columns[table]:
+            continue
         try:
             conn.execute(sql)
         except sqlite3.OperationalError:
-            pass  # Column already exists
+            pass  # Table missing on this database
 
     _migrate_alert_entities_table(conn)
 
@@ -596,6 +623,10 @@ def migrate_schema():
         "CREATE INDEX IF NOT EXISTS idx_alerts_duplicate_of ON alerts(duplicate_of)",
         "CREATE INDEX IF NOT EXISTS idx_alerts_created_date ON alerts(created_at)",
         "CREATE INDEX IF NOT EXISTS idx_alerts_published_date ON alerts(published_at)",
+        # Partial indexes so the startup backfills below only visit rows that need them.
+        "CREATE INDEX IF NOT EXISTS idx_alerts_risk_null ON alerts(id) WHERE risk_score IS NULL",
+        "CREATE INDEX IF NOT EXISTS idx_alerts_ors_unset ON alerts(id) WHERE ors_score IS NULL OR ors_score = 0.0",
+        "CREATE INDEX IF NOT EXISTS idx_alerts_tas_null ON alerts(id) WHERE tas_score IS NULL",
         "CREATE INDEX IF NOT EXISTS idx_keyword_frequency_kw_date ON keyword_frequency(keyword_id, date)",
         "CREATE INDEX IF NOT EXISTS idx_alert_entities_alert ON alert_entities(alert_id)",
         "CREATE INDEX IF NOT EXISTS idx_alert_entities_type_value ON alert_entities(entity_type, entity_value)",
@@ -627,9 +658,17 @@ def migrate_schema():
     conn.execute("UPDATE sources SET fail_streak = 0 WHERE fail_streak IS NULL")
     conn.execute("UPDATE sources SET last_status = 'unknown' WHERE last_status IS NULL")
     conn.execute("UPDATE alerts SET risk_score = 0.0 WHERE risk_score IS NULL")
-    conn.execute("UPDATE alerts SET ors_score = risk_score WHERE ors_score IS NULL OR ors_score = 0.0")
+    # Skip rows the backfill would rewrite to the same value, so a restart
+    # doesn't touch every unscored alert again.
+    conn.execute(
+        "UPDATE alerts SET ors_score = risk_score "
+        "WHERE (ors_score IS NULL OR ors_score = 0.0) AND ors_score IS NOT risk_score"
+    )
     conn.execute("UPDATE alerts SET tas_score = 0.0 WHERE tas_score IS NULL")
-    conn.execute("UPDATE alerts SET published_at = created_at WHERE published_at IS NULL")
+    conn.execute(
+        "UPDATE alerts SET published_at = created_at "
+        "WHERE published_at IS NULL AND created_at IS NOT NULL"
+    )
     conn.commit()
     conn.close()
 
@@ -649,13 +688,18 @@ def build_gdelt_rss_url(query, maxrecords=100, timespan="24h", sort="datedesc"):
     if not query_text:
         raise ValueError("query must not be empty")
     safe_maxrecords = max(1, min(250, int(maxrecords)))
+    return _gdelt_rss_url(query_text, safe_maxrecords, str(timespan), str(sort))
+
+
+@lru_cache(maxsize=256)
+def _gdelt_rss_url(query_text, maxrecords, timespan, sort):
     params = {
         "query": query_text,
         "mode": "artlist",
         "format": "rss",
-        "maxrecords": safe_maxrecords,
-        "timespan": str(timespan),
-        "sort": str(sort),
+        "maxrecords": maxrecords,
+        "timespan": timespan,
+        "sort": sort,
     }
     return f"{GDELT_DOC_API_BASE_URL}?{urlencode(params, quote_via=quote_plus)}"
 
@@ -673,9 +717,16 @@ def load_watchlist_yaml(config_path=None):
         <category>: [term, ...] or [{term, weight}, ...]
     """
     watchlist_path = config_path or WATCHLIST_CONFIG_PATH
-    if not os.path.exists(watchlist_path):
+    try:
+        stat = os.stat(watchlist_path)
+    except OSError:
         return None
+    # Parsed once per file version; callers get their own copy to mutate.
+    return copy.deepcopy(_load_watchlist_cached(watchlist_path, stat.st_mtime_ns, stat.st_size))
 
+
+@lru_cache(maxsize=4)
+def _load_watchlist_cached(watchlist_path, mtime_ns, size):
     try:
         with open(watchlist_path, "r", encoding="utf-8") as f:
             payload = yaml.safe_load(f) or {}
@@ -941,18 +992,29 @@ def seed_default_sources():
         ]
         seed_origin = "hardcoded defaults"
 
-    for name, url, source_type, credibility in sources:
-        existing = conn.execute("SELECT id FROM sources WHERE url = ?", (url,)).fetchone()
-        if existing:
-            conn.execute(
-                "UPDATE sources SET name = ?, source_type = ?, credibility_score = ? WHERE id = ?",
-                (name, source_type, credibility, existing["id"]),
-            )
-        else:
-            conn.execute(
-                "INSERT INTO sources (name, url, source_type, credibility_score) VALUES (?, ?, ?, ?)",
-                (name, url, source_type, credibility),
-            )
+    # sources.url carries no UNIQUE constraint (or index), so match URLs in
+    # Python: insert missing URLs, then apply every row's values in order to
+    # the lowest id holding that URL (duplicate URL rows are left alone).
+    existing_urls = {row[0] for row in conn.execute("SELECT url FROM sources")}
+    new_sources = []
+    for source in sources:
+        if source[1] not in existing_urls:
+            existing_urls.add(source[1])
+            new_sources.append(source)
+    conn.executemany(
+        "INSERT INTO sources (name, url, source_type, credibility_score) VALUES (?, ?, ?, ?)",
+        new_sources,
+    )
+    first_id_by_url = {}
+    for source_id, url in conn.execute("SELECT id, url FROM sources ORDER BY id"):
+        first_id_by_url.setdefault(url, source_id)
+    conn.executemany(
+        "UPDATE sources SET name = ?, source_type = ?, credibility_score = ? WHERE id = ?",
+        [
+            (name, source_type, credibility, first_id_by_url[url])
+            for name, url, source_type, credibility in sources
+        ],
+    )
     # Keep demo fixture sources from polluting normal scrape runs.
     conn.execute(
         """UPDATE sources
@@ -1005,21 +1067,18 @@ def seed_default_keywords():
         ]
         seed_origin = "hardcoded defaults"
 
-    for term, category, weight in keywords:
-        existing = conn.execute("SELECT id FROM keywords WHERE term = ?", (term,)).fetchone()
-        if existing:
-            conn.execute(
-                "UPDATE keywords SET category = ?, weight = ? WHERE id = ?",
-                (category, weight, existing["id"]),
-            )
-        else:
-            try:
-                conn.execute(
-                    "INSERT INTO keywords (term, category, weight) VALUES (?, ?, ?)",
-                    (term, category, weight),
-                )
-            except sqlite3.IntegrityError:
-                pass
+    # Insert-if-missing then update, rather than ON CONFLICT DO UPDATE, which
+    # would burn an AUTOINCREMENT id per existing term on every startup.
+    conn.executemany(
+        """INSERT INTO keywords (term, category, weight)
+        SELECT ?, ?, ?
+        WHERE NOT EXISTS (SELECT 1 FROM keywords WHERE term = ?)""",
+        [(*keyword, keyword[0]) for keyword in keywords],
+    )
+    conn.executemany(
+        "UPDATE keywords SET category = ?, weight = ? WHERE term = ?",
+        [(category, weight, term) for term, category, weight in keywords],
+    )
     conn.commit()
     conn.close()
     print(f"Default keywords seeded from {seed_origin}.")
@@ -1334,13 +1393,12 @@ def seed_threat_actors():
         conn.close()
         print("Threat actor seed list is empty; skipping.")
         return
-    for name, aliases, description in actors:
-        existing = conn.execute("SELECT id FROM threat_actors WHERE name = ?", (name,)).fetchone()
-        if not existing:
-            conn.execute(
-                "INSERT INTO threat_actors (name, aliases, description) VALUES (?, ?, ?)",
-                (name, aliases, description),
-            )
+    conn.executemany(
+        """INSERT INTO threat_actors (name, aliases, description)
+        SELECT ?, ?, ?
+        WHERE NOT EXISTS (SELECT 1 FROM threat_actors WHERE name = ?)""",
+        [(name, aliases, description, name) for name, aliases, description in actors],
+    )
     conn.commit()
     conn.close()
     print("Threat actors seeded.")
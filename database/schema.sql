@@ -150,6 +150,7 @@ CREATE TABLE IF NOT EXISTS alert_score_intervals (
     std REAL NOT NULL,
     computed_at TEXT NOT NULL,
     method TEXT NOT NULL,
+    inputs_hash TEXT,
     FOREIGN KEY (alert_id) REFERENCES alerts(id) ON DELETE CASCADE
 );
 
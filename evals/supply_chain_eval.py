@@ -20,7 +20,8 @@ def _evaluate_scored_profiles(scored_profiles: list[dict], threshold: float = 45
     for profile in scored_profiles:
         expected_label = str(profile.get("expected_label") or "").strip().lower()
         expected_positive = expected_label in POSITIVE_LABELS
-        predicted_positive = float(profile.get("vendor_risk_score") or 0.0) >= safe_threshold
+        score = float(profile.get("vendor_risk_score") or 0.0)
+        predicted_positive = score >= safe_threshold
 
         if predicted_positive and expected_positive:
             tp += 1
@@ -39,7 +40,7 @@ def _evaluate_scored_profiles(scored_profiles: list[dict], threshold: float = 45
                 "expected_positive": expected_positive,
                 "predicted_positive": predicted_positive,
                 "risk_tier": profile.get("risk_tier"),
-                "score": round(float(profile.get("vendor_risk_score") or 0.0), 3),
+                "score": round(score, 3),
                 "reason_codes": profile.get("reason_codes") or [],
             }
         )
@@ -275,3 +275,42 @@ def test_build_gdelt_rss_url_encodes_query():
     assert "maxrecords=100" in url
     assert "sort=datedesc" in url
     assert "query=%28%22death+threat%22+OR+swatting%29+AND+CEO" in url
+
+
+def test_get_connection_enables_wal(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_init, "DB_PATH", str(tmp_path / "wal.db"))
+
+    conn = db_init.get_connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    conn.close()
+
+
+def test_load_watchlist_yaml_reparses_only_on_change(tmp_path):
+    watchlist_path = tmp_path / "watchlist.yaml"
+    _write_watchlist(
+        watchlist_path,
+        """
+        keywords:
+          protest:
+            - "rally"
+        """,
+    )
+
+    first = db_init.load_watchlist_yaml(str(watchlist_path))
+    first["keywords"].clear()
+    second = db_init.load_watchlist_yaml(str(watchlist_path))
+    assert [k["term"] for k in second["keywords"]] == ["rally"]
+
+    _write_watchlist(
+        watchlist_path,
+        """
+        keywords:
+          protest:
+            - "rally"
+            - "blockade"
+        """,
+    )
+    third = db_init.load_watchlist_yaml(str(watchlist_path))
+    assert [k["term"] for k in third["keywords"]] == ["rally", "blockade"]
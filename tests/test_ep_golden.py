@@ -11,6 +11,7 @@ seeded with the default watchlist (Magnificent 7 CEOs, real HQs, etc.).
 
 import json
 import math
+import os
 import sys
 from pathlib import Path
 
@@ -20,18 +21,32 @@ import pytest
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from analytics import tas_assessment
 from analytics.behavioral_assessment import (
+    INDICATOR_NAMES,
     PATHWAY_WEIGHTS,
     compute_pathway_score,
+    compute_pathway_score_batch,
     determine_escalation_trend,
+    get_subject_history,
+    get_subject_history_df,
     score_to_risk_tier,
+    upsert_assessment,
+    upsert_assessments_bulk,
 )
 from analytics.location_enrichment import update_alert_proximity
 from analytics.poi_matching import get_active_poi_aliases, match_pois
 from analytics.sitrep import generate_sitrep_for_poi_escalation
 from analytics.tas_assessment import (
+    LEAKAGE_PATTERNS,
+    PATHWAY_PATTERNS,
+    TARGETING_TIME_PATTERNS,
+    _LEAKAGE_SCAN,
+    _PATHWAY_SCAN,
+    _TARGETING_TIME_SCAN,
     build_escalation_explanation,
     compute_poi_assessment,
+    update_alert_tas,
 )
 from database.init_db import get_connection
 
@@ -316,6 +331,49 @@ class TestTASScoring:
         # Empty dict or no tas_score key indicates no threat data
         assert payload.get("tas_score") is None or payload == {}
 
+    def test_alert_tas_matches_per_poi_assessments(self, client):
+        """update_alert_tas() assesses all of an alert's POIs in one pass and
+        must agree with assessing each POI on its own."""
+        conn = get_connection()
+        poi_ids = [
+            row["id"] for row in conn.execute("SELECT id FROM pois ORDER BY id LIMIT 2").fetchall()
+        ]
+        alert_id = _insert_alert_with_poi_hit(
+            conn, poi_ids[0], "I will be at the venue entrance tomorrow"
+        )
+        conn.execute(
+            """INSERT INTO poi_hits
+            (poi_id, alert_id, match_type, match_value, match_score, context)
+            VALUES (?, ?, 'exact', 'alias', 1.0, 'second protectee')""",
+            (poi_ids[1], alert_id),
+        )
+        _insert_alert_with_poi_hit(conn, poi_ids[1], "Posted the parking schedule")
+
+        result = update_alert_tas(conn, alert_id)
+        expected = [compute_poi_assessment(conn, poi_id, window_days=14) for poi_id in poi_ids]
+        conn.close()
+
+        assert result["pois"] == expected
+        assert result["tas_score"] == max(a["tas_score"] for a in expected)
+
+    def test_combined_flag_scans_match_pattern_lists(self):
+        """Each TRAP-lite group's combined scan agrees with its pattern list."""
+        samples = [
+            "I will be there tomorrow",
+            "Posted the route to the venue parking",
+            "See you on Friday at 9:30 between 8 and 10",
+            "Nothing notable in this post",
+            "They plan to check the security gate this week",
+        ]
+        groups = [
+            (_LEAKAGE_SCAN, LEAKAGE_PATTERNS),
+            (_PATHWAY_SCAN, PATHWAY_PATTERNS),
+            (_TARGETING_TIME_SCAN, TARGETING_TIME_PATTERNS),
+        ]
+        for text in samples:
+            for scan, patterns in groups:
+                assert bool(scan.search(text)) == any(p.search(text) for p in patterns)
+
 
 # ---------------------------------------------------------------------------
 # 5. Escalation tier resolution
@@ -362,6 +420,44 @@ class TestEscalationTierResolution:
             f"got {explanation['escalation_tier']}"
         )
 
+    def test_escalation_tiers_reload_when_config_changes(self, tmp_path, monkeypatch):
+        """Tiers are parsed once per watchlist.yaml mtime and re-read after an edit."""
+        config_path = tmp_path / "watchlist.yaml"
+        config_path.write_text(
+            "escalation_tiers:\n"
+            "  - {threshold: 0, label: LOW}\n"
+            "  - {threshold: 50, label: HIGH}\n"
+        )
+        monkeypatch.setattr(tas_assessment, "WATCHLIST_CONFIG_PATH", str(config_path))
+        monkeypatch.setattr(tas_assessment, "_TIERS_CACHE", {"mtime": None, "tiers": None})
+
+        tiers, thresholds = tas_assessment._load_escalation_tiers()
+        assert [tier["label"] for tier in tiers] == ["HIGH", "LOW"]
+        assert thresholds == [0, 50]
+        assert tas_assessment._load_escalation_tiers()[0] is tiers
+
+        config_path.write_text("escalation_tiers:\n  - {threshold: 0, label: ONLY}\n")
+        stat = config_path.stat()
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert tas_assessment._resolve_escalation_tier(75.0)["label"] == "ONLY"
+
+    def test_escalation_explanation_does_not_share_cached_tiers(self, tmp_path, monkeypatch):
+        """Editing one explanation's notify list leaves later explanations intact."""
+        config_path = tmp_path / "watchlist.yaml"
+        config_path.write_text(
+            "escalation_tiers:\n  - {threshold: 0, label: LOW, notify: [intel_analyst]}\n"
+        )
+        monkeypatch.setattr(tas_assessment, "WATCHLIST_CONFIG_PATH", str(config_path))
+        monkeypatch.setattr(tas_assessment, "_TIERS_CACHE", {"mtime": None, "tiers": None})
+
+        first = build_escalation_explanation({"tas_score": 10.0})
+        first["notify"].append("detail_leader")
+        tas_assessment._resolve_escalation_tier(10.0)["label"] = "EDITED"
+
+        second = build_escalation_explanation({"tas_score": 10.0})
+        assert second["notify"] == ["intel_analyst"]
+        assert second["escalation_tier"] == "LOW"
+
 
 # ---------------------------------------------------------------------------
 # 6. Behavioral assessment (pathway-to-violence)
@@ -424,6 +520,22 @@ class TestBehavioralAssessment:
             f"Expected {expected}, got {score}"
         )
 
+    def test_batch_pathway_scores_match_scalar(self, client):
+        """Batch pathway scoring must agree with the per-subject function.
+
+        EP concept: Bulk recomputation across all active subjects must
+        yield the same composite score an analyst sees for one subject.
+        """
+        rows = [
+            [0.8, 0.6, 0.0, 0.5, 0.3, 0.9, 0.0, 1.0],
+            [1.0] * 8,
+            [0.0] * 8,
+            [1.5, -0.2, 0.33, 0.67, 0.1, 0.45, 0.9, 0.05],
+        ]
+        batch = compute_pathway_score_batch(rows).tolist()
+        expected = [compute_pathway_score(dict(zip(INDICATOR_NAMES, row))) for row in rows]
+        assert batch == expected
+
     def test_score_to_risk_tier_mapping(self, client):
         """Behavioral pathway score maps to the correct risk tier.
 
@@ -576,6 +688,89 @@ class TestBehavioralTrend:
             "Score 50 vs avg 70 should yield 'decreasing' trend"
         )
 
+    def test_bulk_upsert_matches_single_upserts(self, client):
+        """Bulk re-scoring must store the same assessments and subject
+        tiers as calling upsert_assessment() once per subject."""
+        conn = get_connection()
+        subject_ids = []
+        for name in ("Bulk Single", "Bulk Batch"):
+            conn.execute(
+                """INSERT INTO threat_subjects
+                (name, aliases, status, risk_tier)
+                VALUES (?, '[]', 'monitoring', 'LOW')""",
+                (name,),
+            )
+            subject_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            for i in range(3):
+                conn.execute(
+                    """INSERT INTO threat_subject_assessments
+                    (subject_id, assessment_date, pathway_score, escalation_trend)
+                    VALUES (?, date('now', ?), ?, 'stable')""",
+                    (subject_id, f"-{i + 1} days", 20.0),
+                )
+            subject_ids.append(subject_id)
+        conn.commit()
+
+        indicators = {name: 0.6 for name in INDICATOR_NAMES}
+        single = upsert_assessment(conn, subject_ids[0], indicators, source_alert_ids=[7])
+        (bulk,) = upsert_assessments_bulk(
+            conn,
+            [{"subject_id": subject_ids[1], "indicators": indicators, "source_alert_ids": [7]}],
+        )
+        conn.commit()
+
+        assert {**bulk, "subject_id": None} == {**single, "subject_id": None}
+        rows = [
+            conn.execute(
+                """SELECT pathway_score, escalation_trend, source_alert_ids
+                FROM threat_subject_assessments
+                WHERE subject_id = ? AND assessment_date = ?""",
+                (subject_id, single["assessment_date"]),
+            ).fetchone()
+            for subject_id in subject_ids
+        ]
+        tiers = [
+            conn.execute(
+                "SELECT risk_tier, status FROM threat_subjects WHERE id = ?", (subject_id,)
+            ).fetchone()
+            for subject_id in subject_ids
+        ]
+        conn.close()
+
+        assert dict(rows[0]) == dict(rows[1])
+        assert bulk["escalation_trend"] == "increasing"
+        assert dict(tiers[0]) == dict(tiers[1]) == {"risk_tier": "ELEVATED", "status": "active"}
+
+    def test_subject_history_frame_matches_dict_rows(self, client):
+        """The DataFrame history must hold the same rows and columns as the
+        dict variant, ready for compute_pathway_score_batch()."""
+        conn = get_connection()
+        conn.execute(
+            """INSERT INTO threat_subjects
+            (name, aliases, status, risk_tier)
+            VALUES ('History Frame', '[]', 'active', 'LOW')"""
+        )
+        subject_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        for i, level in enumerate((0.2, 0.5, 0.9)):
+            conn.execute(
+                """INSERT INTO threat_subject_assessments
+                (subject_id, assessment_date, grievance_level, leakage, pathway_score)
+                VALUES (?, date('now', ?), ?, ?, ?)""",
+                (subject_id, f"-{i} days", level, level, level * 25.0),
+            )
+        conn.commit()
+
+        rows = get_subject_history(conn, subject_id)
+        frame = get_subject_history_df(conn, subject_id)
+        conn.close()
+
+        assert list(frame.columns) == list(rows[0])
+        assert frame["assessment_date"].tolist() == [row["assessment_date"] for row in rows]
+        assert frame["pathway_score"].tolist() == [row["pathway_score"] for row in rows]
+        batch = compute_pathway_score_batch(frame[INDICATOR_NAMES].to_numpy())
+        expected = [compute_pathway_score(row) for row in rows]
+        assert batch.tolist() == pytest.approx(expected)
+
 
 # ---------------------------------------------------------------------------
 # 8. SITREP generation
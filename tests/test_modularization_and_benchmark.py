@@ -1,3 +1,5 @@
+from analytics.backtesting import run_backtest, run_backtest_columns
+from analytics.ml_classifier import evaluate_loo
 from evals.benchmark import build_benchmark_metrics, render_benchmark_markdown
 from processor.correlation import build_incident_threads
 
@@ -18,3 +20,32 @@ def test_evals_benchmark_metrics_shape_and_markdown():
     assert "# Benchmark Table" in markdown
     assert "| Model | Accuracy |" in markdown
     assert "| Model | Precision | Recall | F1 | False Positives |" in markdown
+
+
+def test_run_backtest_returns_independent_copies():
+    first = run_backtest()
+    first["incidents"][0]["full_score"] = -1.0
+    first["aggregate"]["full_correct"] = -1
+
+    second = run_backtest()
+    assert second["incidents"][0]["full_score"] != -1.0
+    assert second["aggregate"]["full_correct"] != -1
+
+
+def test_run_backtest_columns_match_incident_rows():
+    rows = run_backtest()["incidents"]
+    columns = run_backtest_columns()
+
+    assert set(columns) == set(rows[0])
+    for key, values in columns.items():
+        assert values == [row[key] for row in rows]
+
+
+def test_evaluate_loo_returns_independent_copies():
+    first = evaluate_loo()
+    first["predictions"][0]["predicted"] = "tampered"
+    first["accuracy"] = -1.0
+
+    second = evaluate_loo()
+    assert second["predictions"][0]["predicted"] != "tampered"
+    assert second["accuracy"] != -1.0
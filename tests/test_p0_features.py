@@ -1,5 +1,6 @@
 import math
 from datetime import timedelta
+from types import SimpleNamespace
 
 from analytics.entity_extraction import extract_and_store_alert_entities
 from analytics.utils import utcnow
@@ -45,6 +46,164 @@ def test_extraction_regex_fallback_finds_cve(monkeypatch):
     assert result["meta"]["extractor_used"] == "regex"
 
 
+def test_extraction_reuses_spacy_entities_for_repeated_text(monkeypatch):
+    import analytics.extraction as extraction
+
+    calls = []
+
+    class _Ent:
+        def __init__(self, label, text, start):
+            self.label_ = label
+            self.text = text
+            self.start_char = start
+            self.end_char = start + len(text)
+
+    def _fake_nlp(text):
+        calls.append(text)
+        return SimpleNamespace(ents=[_Ent("ORG", "Acme Corp", 0), _Ent("DATE", "today", 20)])
+
+    monkeypatch.setattr(extraction, "_SPACY_ATTEMPTED", True)
+    monkeypatch.setattr(extraction, "_SPACY_NLP", _fake_nlp)
+    extraction._spacy_entities.cache_clear()
+
+    text = "Acme Corp was named today in a repost."
+    first = extract(text)
+    second = extract(text)
+    extraction._spacy_entities.cache_clear()
+
+    assert len(calls) == 1
+    assert first["entities"] == second["entities"]
+    assert [(e["type"], e["value"]) for e in first["entities"]] == [("ORG", "Acme Corp")]
+    assert first["meta"]["extractor_used"] == "spacy+regex"
+
+
+def test_extract_batch_runs_spacy_once_and_matches_extract(monkeypatch):
+    import analytics.extraction as extraction
+
+    pipe_calls = []
+
+    class _Ent:
+        label_ = "ORG"
+        text = "Acme Corp"
+        start_char = 0
+        end_char = 9
+
+    class _FakeNlp:
+        def __call__(self, text):
+            return SimpleNamespace(ents=[_Ent()] if text.startswith("Acme") else [])
+
+        def pipe(self, texts, batch_size):
+            texts = list(texts)
+            pipe_calls.append(texts)
+            return [self(text) for text in texts]
+
+    monkeypatch.setattr(extraction, "_SPACY_ATTEMPTED", True)
+    monkeypatch.setattr(extraction, "_SPACY_NLP", _FakeNlp())
+    extraction._spacy_entities.cache_clear()
+
+    texts = ["Acme Corp leaked CVE-2026-11111.", None, "Traffic from 8.8.8.8."]
+    batch = extraction.extract_batch(texts)
+    single = [extract(text) for text in texts]
+    extraction._spacy_entities.cache_clear()
+
+    assert len(pipe_calls) == 1
+    assert batch == single
+
+
+def test_extraction_keeps_iocs_embedded_in_urls_and_skips_url_domains():
+    from analytics.extraction import _extract_iocs
+
+    findings = _extract_iocs(
+        "Payload at http://10.0.0.5/drop/5d41402abc4b2a76b9719d911017c592.bin "
+        "and https://evil.example.com/a; mail admin@evil.org"
+    )
+    found = {(item["type"], item["value"]) for item in findings}
+
+    assert ("ipv4", "10.0.0.5") in found
+    assert ("md5", "5d41402abc4b2a76b9719d911017c592") in found
+    assert ("email", "admin@evil.org") in found
+    assert not any(ioc_type == "domain" for ioc_type, _ in found)
+
+
+def test_extraction_keeps_iocs_in_email_local_parts():
+    from analytics.extraction import _extract_iocs
+
+    found_ip = {(i["type"], i["value"]) for i in _extract_iocs("reply to 1.2.3.4@evil.com")}
+    found_md5 = {
+        (i["type"], i["value"]) for i in _extract_iocs("d41d8cd98f00b204e9800998ecf8427e@evil.com")
+    }
+
+    assert found_ip == {("ipv4", "1.2.3.4"), ("email", "1.2.3.4@evil.com")}
+    assert found_md5 == {
+        ("md5", "d41d8cd98f00b204e9800998ecf8427e"),
+        ("email", "d41d8cd98f00b204e9800998ecf8427e@evil.com"),
+    }
+
+
+def test_extraction_keeps_iocs_that_straddle_an_ipv6_match():
+    from analytics.extraction import _extract_iocs
+
+    findings = _extract_iocs("seen 10:20:30.example.com and ::ffff:192.168.1.1")
+    found = {(item["type"], item["value"]) for item in findings}
+
+    assert ("domain", "30.example.com") in found
+    assert ("ipv6", "10:20:30") in found
+    assert ("ipv4", "192.168.1.1") in found
+
+
+def test_extraction_skips_file_names_but_keeps_real_domains():
+    from analytics.extraction import _extract_iocs
+
+    findings = _extract_iocs(
+        "Dropper invoice.PDF launches payload.exe from cdn.evil.zip; see report.docx"
+    )
+    domains = {item["value"] for item in findings if item["type"] == "domain"}
+
+    assert domains == {"cdn.evil.zip"}
+
+
+def test_extraction_caps_ioc_scan_length(monkeypatch):
+    from analytics import extraction
+
+    monkeypatch.setattr(extraction, "MAX_IOC_SCAN_CHARS", 40)
+    result = extraction.extract("C2 at 10.0.0.5 ".ljust(60, ".") + " beacon 10.0.0.6")
+    values = [item["value"] for item in result["iocs"]]
+
+    assert values == ["10.0.0.5"]
+    assert result["meta"]["ioc_scan_truncated"] is True
+
+
+def test_extraction_bounds_scan_time_on_long_dotted_runs():
+    import time
+
+    from analytics.extraction import MAX_IOC_SCAN_CHARS, _extract_iocs
+
+    tail = "1 then mail ops@evil.example.com"
+    started = time.perf_counter()
+    findings = _extract_iocs("a." * ((MAX_IOC_SCAN_CHARS - len(tail)) // 2) + tail)
+    elapsed = time.perf_counter() - started
+
+    # The unbounded label/local-part patterns took ~250s here, 127 labels ~2s.
+    assert elapsed < 2.0
+    assert [item["value"] for item in findings] == ["ops@evil.example.com"]
+
+
+def test_extraction_keeps_trailing_labels_of_names_longer_than_the_label_cap():
+    from analytics.entity_extraction import extract_iocs
+    from analytics.extraction import _extract_iocs
+
+    labels = [f"lab{chr(97 + i // 26)}{chr(97 + i % 26)}" for i in range(40)]
+    text = f"beacon to {'.'.join(labels)}.com then host.example.com.8080"
+    trailing = ".".join(labels[-31:]) + ".com"
+
+    domains = [item["value"] for item in _extract_iocs(text) if item["type"] == "domain"]
+    assert domains == [trailing, "host.example.com"]
+    regex_domains = [
+        item["entity_value"] for item in extract_iocs(text) if item["entity_type"] == "domain"
+    ]
+    assert regex_domains == [trailing, "host.example.com"]
+
+
 def test_ioc_endpoint_and_daily_report_include_cve(client):
     conn = get_connection()
     source_id = conn.execute("SELECT id FROM sources ORDER BY id LIMIT 1").fetchone()["id"]
@@ -137,6 +296,27 @@ def test_uncertainty_interval_width_shrinks_with_more_evidence():
     assert (broad["p95"] - broad["p05"]) > (narrow["p95"] - narrow["p05"])
 
 
+def test_uncertainty_interval_is_seed_reproducible_and_json_safe():
+    kwargs = dict(
+        keyword_weight=3.0,
+        keyword_sigma=0.5,
+        freq_factor=1.5,
+        recency_factor=0.8,
+        alpha=4,
+        beta=2,
+        n=800,
+    )
+    first = score_distribution(**kwargs, seed=11)
+    again = score_distribution(**kwargs, seed=11)
+    other = score_distribution(**kwargs, seed=12)
+
+    assert first == again
+    assert first != other
+    assert first["n"] == 800
+    assert all(type(first[key]) is float for key in ("mean", "std", "p05", "p50", "p95"))
+    assert 0.0 <= first["p05"] <= first["p50"] <= first["p95"] <= 100.0
+
+
 def test_score_endpoint_uncertainty_works_without_weight_sigma(client):
     conn = get_connection()
     source_id = conn.execute("SELECT id FROM sources ORDER BY id LIMIT 1").fetchone()["id"]
@@ -176,6 +356,85 @@ def test_score_endpoint_uncertainty_works_without_weight_sigma(client):
     assert payload["uncertainty"]["std"] is not None
 
 
+def test_uncertainty_cache_tracks_scoring_inputs(client):
+    from analytics.uncertainty import compute_uncertainty_for_alert
+
+    conn = get_connection()
+    source_id = conn.execute("SELECT id FROM sources ORDER BY id LIMIT 1").fetchone()["id"]
+    keyword_id = conn.execute("SELECT id FROM keywords WHERE term = 'stalking'").fetchone()["id"]
+    conn.close()
+    alert_id = _insert_alert(
+        source_id, keyword_id, "Cache check", "content", "https://example.com/mc-cache"
+    )
+    conn = get_connection()
+    score_alert(conn, alert_id, keyword_id, source_id, frequency_override=1.2, z_score_override=0.1)
+    conn.commit()
+    conn.close()
+
+    first = compute_uncertainty_for_alert(alert_id, n=300)
+    conn = get_connection()
+    conn.execute(
+        "UPDATE alert_score_intervals SET computed_at = '2000-01-01 00:00:00' WHERE alert_id = ?",
+        (alert_id,),
+    )
+    conn.commit()
+    conn.close()
+
+    # Unchanged inputs reuse the stored interval however old it is.
+    reused = compute_uncertainty_for_alert(alert_id, n=300)
+    assert reused["computed_at"] == "2000-01-01 00:00:00"
+    assert "inputs_hash" not in reused
+    assert {k: reused[k] for k in ("mean", "p05", "p95")} == {
+        k: first[k] for k in ("mean", "p05", "p95")
+    }
+
+    conn = get_connection()
+    conn.execute("UPDATE sources SET bayesian_alpha = 40.0 WHERE id = ?", (source_id,))
+    conn.commit()
+    conn.close()
+
+    # A changed input invalidates the cached row immediately.
+    recomputed = compute_uncertainty_for_alert(alert_id, n=300)
+    assert recomputed["computed_at"] != "2000-01-01 00:00:00"
+    assert recomputed["mean"] != first["mean"]
+
+
+def test_uncertainty_cache_hits_for_alerts_without_stored_score(client, monkeypatch):
+    from analytics import uncertainty
+
+    conn = get_connection()
+    source_id = conn.execute("SELECT id FROM sources ORDER BY id LIMIT 1").fetchone()["id"]
+    keyword_id = conn.execute("SELECT id FROM keywords WHERE term = 'stalking'").fetchone()["id"]
+    conn.close()
+    alert_id = _insert_alert(
+        source_id, keyword_id, "Unscored", "content", "https://example.com/mc-unscored"
+    )
+
+    first = uncertainty.compute_uncertainty_for_alert(alert_id, n=300)
+    simulate = uncertainty.score_distribution
+
+    # Recency comes from the clock here; the second call must not re-simulate.
+    def _no_simulation(**_kwargs):
+        raise AssertionError("cached interval was not reused")
+
+    monkeypatch.setattr(uncertainty, "score_distribution", _no_simulation)
+    second = uncertainty.compute_uncertainty_for_alert(alert_id, n=300)
+    assert second["computed_at"] == first["computed_at"]
+    assert second["mean"] == first["mean"]
+
+    # Past cache_hours the clock-derived recency is refreshed.
+    monkeypatch.setattr(uncertainty, "score_distribution", simulate)
+    conn = get_connection()
+    conn.execute(
+        "UPDATE alert_score_intervals SET computed_at = '2000-01-01 00:00:00' WHERE alert_id = ?",
+        (alert_id,),
+    )
+    conn.commit()
+    conn.close()
+    refreshed = uncertainty.compute_uncertainty_for_alert(alert_id, n=300)
+    assert refreshed["computed_at"] != "2000-01-01 00:00:00"
+
+
 def test_forecast_fallback_and_ewma_modes(client):
     conn = get_connection()
     keyword_id = conn.execute("SELECT id FROM keywords WHERE term = 'stalking'").fetchone()["id"]
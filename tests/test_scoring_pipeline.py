@@ -1,8 +1,14 @@
+import random
 from datetime import timedelta
 
-from analytics.utils import utcnow
+from analytics.utils import compute_recency_factor, utcnow
 from analytics.risk_scoring import (
+    SEVERITY_LABELS,
     build_frequency_snapshot,
+    compute_risk_score,
+    compute_risk_score_batch,
+    compute_risk_score_from_factor,
+    get_frequency_factor,
     increment_keyword_frequency,
     score_alert,
 )
@@ -105,6 +111,49 @@ def test_frequency_snapshot_keeps_same_keyword_scores_order_independent(client):
     assert scores[0]["risk_score"] == scores[1]["risk_score"]
 
 
+def test_batch_risk_score_matches_scalar_scoring():
+    rows = [
+        (4.8, 0.95, 2.2, 2.0),
+        (3.2, 0.65, 1.3, 14.0),
+        (0.1, 0.0, 1.0, 500.0),
+        (5.0, 1.0, 4.0, -3.0),
+        (2.0, 0.6, 0.7, 96.0),
+    ]
+    scores, severity_codes = compute_risk_score_batch(*zip(*rows))
+
+    expected = [compute_risk_score(*row) for row in rows]
+    assert scores.tolist() == [score for score, _ in expected]
+    assert [SEVERITY_LABELS[code] for code in severity_codes] == [
+        severity for _, severity in expected
+    ]
+
+
+def test_batch_risk_score_rounds_ties_like_scalar_scoring():
+    rng = random.Random(7)
+    rows = [(0.98, 0.625, 2.6, 264.33)] + [
+        (
+            round(rng.uniform(0.1, 5.0), 2),
+            round(rng.uniform(0.0, 1.0), 3),
+            round(rng.uniform(1.0, 4.0), 1),
+            round(rng.uniform(-5.0, 300.0), 2),
+        )
+        for _ in range(50_000)
+    ]
+    scores, _ = compute_risk_score_batch(*zip(*rows))
+
+    assert scores.tolist() == [compute_risk_score(*row)[0] for row in rows]
+
+
+def test_factor_risk_score_matches_hours_risk_score():
+    now = utcnow()
+    for hours in (0.0, 2.5, 14.0, 96.0, 167.9, 500.0):
+        published_at = (now - timedelta(hours=hours)).isoformat()
+        recency_factor, recency_hours = compute_recency_factor(published_at=published_at, now=now)
+        assert compute_risk_score_from_factor(3.2, 0.65, 1.3, recency_factor) == (
+            compute_risk_score(3.2, 0.65, 1.3, recency_hours)
+        )
+
+
 def test_apt_keyword_avoids_plain_language_false_positives():
     keywords = [{"id": 1, "term": "APT", "category": "threat_actor"}]
     assert match_keywords("This is an apt response to the threat.", keywords) == []
@@ -126,3 +175,28 @@ def test_api_startup_does_not_overwrite_keyword_weights(client):
     conn.close()
 
     assert weight == 1.7
+
+
+def test_frequency_snapshot_matches_per_keyword_lookup(client):
+    conn = get_connection()
+    keyword_ids = [
+        row["id"] for row in conn.execute("SELECT id FROM keywords ORDER BY id LIMIT 4").fetchall()
+    ]
+    histories = [(3, 4, 2, 5, 3), (1, 1), (10, 2, 7, 1, 9, 4, 6), ()]
+    for keyword_id, history in zip(keyword_ids, histories):
+        for days_ago, count in enumerate(history, start=1):
+            day = (utcnow() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+            conn.execute(
+                "INSERT INTO keyword_frequency (keyword_id, date, count) VALUES (?, ?, ?)",
+                (keyword_id, day, count),
+            )
+        increment_keyword_frequency(conn, keyword_id, increment_by=len(history) + 3)
+    conn.commit()
+
+    snapshot = build_frequency_snapshot(conn, keyword_ids=keyword_ids + [None])
+    expected = {
+        keyword_id: get_frequency_factor(conn, keyword_id) for keyword_id in keyword_ids + [None]
+    }
+    conn.close()
+
+    assert snapshot == expected